@@ -0,0 +1,347 @@
+# api/server.py
+# Headless HTTP/JSON server for kiosks and the web front-end (python main.py --serve).
+# One process, one shared asyncpg pool, HTTP/1.1 keep-alive, and a cap on how many
+# requests may hit the database at once. Listens on localhost unless --host says
+# otherwise; anything touching loans or memberships needs the token from /login.
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import time
+import traceback
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+
+import asyncpg
+
+from config.database import create_async_pool
+from dao.async_dao import AsyncUserDAO, AsyncBookDAO, AsyncLoanDAO, AsyncClubDAO
+from utils.constants import MAX_LOANS, ROLE_LIBRARIAN
+
+SESSION_TTL = 8 * 3600   # one working shift
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1024 * 1024
+INT4_MAX = 2 ** 31 - 1
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+    404: "Not Found", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _require(body, *keys):
+    missing = [k for k in keys if k not in body]
+    if missing:
+        raise HttpError(400, f"missing field(s): {', '.join(missing)}")
+    return [body[k] for k in keys]
+
+def _as_int(value, name):
+    """A path or body field as an INT column value; anything else is the client's 400."""
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not -INT4_MAX - 1 <= value <= INT4_MAX:
+        raise HttpError(400, f"{name} must be an integer")
+    return value
+
+def _require_int(body, *keys):
+    return [_as_int(value, key) for key, value in zip(keys, _require(body, *keys))]
+
+def _require_str(body, *keys):
+    values = _require(body, *keys)
+    for key, value in zip(keys, values):
+        if not isinstance(value, str):
+            raise HttpError(400, f"{key} must be a string")
+    return values
+
+# ────────────────────── SESSIONS ──────────────────────
+class SessionStore:
+    """Bearer tokens issued by /login, held in memory for ttl seconds.
+
+    Tokens do not survive a restart; clients simply log in again.
+    """
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}      # token -> (user row from login, expiry on the monotonic clock)
+        self._expiries = deque() # (expiry, token) in creation order; one ttl means expiry order too
+
+    def _purge(self, now):
+        # Only the expired front of the queue is touched, so this is O(1) amortized.
+        while self._expiries and self._expiries[0][0] <= now:
+            self._sessions.pop(self._expiries.popleft()[1], None)
+
+    def create(self, user):
+        now = time.monotonic()
+        self._purge(now)
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = (user, now + self.ttl)
+        self._expiries.append((now + self.ttl, token))
+        return token
+
+    def get(self, token):
+        self._purge(time.monotonic())
+        entry = self._sessions.get(token)
+        return entry[0] if entry else None
+
+    def drop(self, token):
+        self._sessions.pop(token, None)
+
+sessions = SessionStore()
+
+def _bearer_token(headers):
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    return token.strip() if scheme.lower() == "bearer" else None
+
+def _acting_member(session, requested):
+    """Member a request acts for: librarians name one, members only ever act for themselves."""
+    if session["role"] == ROLE_LIBRARIAN:
+        if requested is None:
+            raise HttpError(400, "missing field(s): member_id")
+        return _as_int(requested, "member_id")
+    if session["member_id"] is None:
+        raise HttpError(403, "This account has no member record")
+    if requested is not None and _as_int(requested, "member_id") != session["member_id"]:
+        raise HttpError(403, "Members can only act for themselves")
+    return session["member_id"]
+
+# ────────────────────── HANDLERS ──────────────────────
+# Each handler gets (pool, session, path params, query dict, JSON body) and returns
+# (status, payload). session is the logged-in user row, or None on public routes.
+
+async def login(pool, session, params, query, body):
+    username, password = _require_str(body, "username", "password")
+    user = await AsyncUserDAO.login(pool, username, password)
+    if not user:
+        raise HttpError(401, "Invalid username or password")
+    return 200, {**user, "token": sessions.create(user)}
+
+async def logout(pool, session, params, query, body):
+    sessions.drop(session["token"])
+    return 200, {"logged_out": True}
+
+async def list_books(pool, session, params, query, body):
+    return 200, await AsyncBookDAO.get_available_books(pool, query.get("search", ""))
+
+async def get_book(pool, session, params, query, body):
+    book = await AsyncBookDAO.get_book(pool, _as_int(params["book_id"], "book_id"))
+    if not book:
+        raise HttpError(404, "No such book")
+    return 200, book
+
+async def member_loans(pool, session, params, query, body):
+    member_id = _acting_member(session, params["member_id"])
+    return 200, await AsyncLoanDAO.get_member_loans(pool, member_id)
+
+async def issue_loan(pool, session, params, query, body):
+    book_id, = _require_int(body, "book_id")
+    member_id = _acting_member(session, body.get("member_id"))
+    loan_id = await AsyncLoanDAO.issue_loan(pool, book_id, member_id)
+    if loan_id is None:
+        raise HttpError(409, f"No copy available, or the member already has {MAX_LOANS} "
+                             "books or this title on loan")
+    return 201, {"loan_id": loan_id}
+
+async def return_loan(pool, session, params, query, body):
+    # Librarians return any loan; a member only their own.
+    member_id = None if session["role"] == ROLE_LIBRARIAN else _acting_member(session, None)
+    result = await AsyncLoanDAO.return_loan(pool, _as_int(params["loan_id"], "loan_id"), member_id)
+    if result is None:
+        raise HttpError(404, "No active loan with that id")
+    return 200, result
+
+async def list_clubs(pool, session, params, query, body):
+    return 200, await AsyncClubDAO.get_all_clubs(pool)
+
+async def join_club(pool, session, params, query, body):
+    member_id = _acting_member(session, body.get("member_id"))
+    joined = await AsyncClubDAO.join_club(pool, _as_int(params["club_id"], "club_id"), member_id)
+    return 200, {"joined": joined}
+
+async def leave_club(pool, session, params, query, body):
+    member_id = _acting_member(session, body.get("member_id"))
+    left = await AsyncClubDAO.leave_club(pool, _as_int(params["club_id"], "club_id"), member_id)
+    return 200, {"left": left}
+
+# (method, path, handler, needs a session). Catalog and club listings are public.
+ROUTES = [
+    ("POST", r"/login", login, False),
+    ("POST", r"/logout", logout, True),
+    ("GET", r"/books", list_books, False),
+    ("GET", r"/books/(?P<book_id>\d+)", get_book, False),
+    ("GET", r"/members/(?P<member_id>\d+)/loans", member_loans, True),
+    ("POST", r"/loans", issue_loan, True),
+    ("POST", r"/loans/(?P<loan_id>\d+)/return", return_loan, True),
+    ("GET", r"/clubs", list_clubs, False),
+    ("POST", r"/clubs/(?P<club_id>\d+)/join", join_club, True),
+    ("POST", r"/clubs/(?P<club_id>\d+)/leave", leave_club, True),
+]
+ROUTES = [(method, re.compile(pattern + r"/?$"), handler, needs_session)
+          for method, pattern, handler, needs_session in ROUTES]
+
+# ────────────────────── SERVER ──────────────────────
+class ApiServer:
+    def __init__(self, pool, max_concurrency=32, keepalive_timeout=15.0, request_timeout=10.0):
+        self.pool = pool
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+
+    async def dispatch(self, method, target, headers, raw_body):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        for route_method, pattern, handler, needs_session in ROUTES:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            raise HttpError(404, f"No route for {method} {url.path}")
+
+        session = None
+        token = _bearer_token(headers)
+        user = sessions.get(token) if token else None
+        if user:
+            session = {**user, "token": token}
+        elif needs_session:
+            raise HttpError(401, "Log in first: send the token from /login as 'Authorization: Bearer <token>'")
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            raise HttpError(400, "Body must be JSON")
+        if not isinstance(body, dict):
+            raise HttpError(400, "Body must be a JSON object")
+
+        # Only the handler (and so the DB work) counts against the limit;
+        # idle keep-alive connections cost nothing here.
+        async with self.limit:
+            try:
+                return await handler(self.pool, session, match.groupdict(), query, body)
+            except asyncpg.ForeignKeyViolationError:
+                # e.g. joining a club that does not exist, or lending to an unknown member
+                raise HttpError(404, "No such book, member or club")
+
+    async def read_request(self, reader):
+        line = await asyncio.wait_for(reader.readline(), self.keepalive_timeout)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        # Headers and body share one deadline, so a client trickling a byte at
+        # a time cannot hold the connection open indefinitely.
+        headers, body = await asyncio.wait_for(self.read_headers_and_body(reader), self.request_timeout)
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        return method.upper(), target, headers, body, keep_alive
+
+    @staticmethod
+    async def read_headers_and_body(reader):
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HttpError(400, "Too many headers")
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Body too large")
+        body = await reader.readexactly(length) if length else b""
+        return headers, body
+
+    @staticmethod
+    def write_response(writer, status, payload, keep_alive):
+        data = json.dumps(payload, default=str).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    # idle timeout, client went away, or a line past the stream limit
+                    break
+                except HttpError as e:
+                    self.write_response(writer, e.status, {"error": e.message}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body, keep_alive = request
+                try:
+                    status, payload = await self.dispatch(method, target, headers, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Internal server error"}
+
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host, port):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+async def serve(host="127.0.0.1", port=8080, max_concurrency=32, keepalive_timeout=15.0, request_timeout=10.0):
+    # The pool never needs more connections than requests allowed in flight.
+    pool = await create_async_pool(min_size=2, max_size=max_concurrency)
+    server = await ApiServer(pool, max_concurrency, keepalive_timeout, request_timeout).start(host, port)
+    print(f"Smart Library API listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await pool.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Library headless API server")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="interface to listen on; use 0.0.0.0 to accept kiosks on the network")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=32,
+                        help="requests allowed to use the database at once (also the pool size)")
+    parser.add_argument("--keepalive-timeout", type=float, default=15.0,
+                        help="seconds an idle keep-alive connection is kept open")
+    parser.add_argument("--request-timeout", type=float, default=10.0,
+                        help="seconds a client has to send a request's headers and body")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_concurrency, args.keepalive_timeout,
+                          args.request_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
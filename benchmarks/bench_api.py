@@ -0,0 +1,105 @@
+# benchmarks/bench_api.py
+# Throughput benchmark for the headless API server against the local PostgreSQL
+# configured in config/database.py.
+#
+#   python -m benchmarks.bench_api --clients 64 --duration 10
+#
+# Starts the server in-process on a free port, opens --clients keep-alive
+# connections, logs each one in once and has it loop over a read-heavy kiosk
+# mix (catalog search, book lookup, club list, member loans) with that token
+# until --duration expires. Logging in again per request would only pile up
+# server sessions for the length of the run.
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from api.server import ApiServer
+from config.database import create_async_pool
+
+SEARCHES = ["", "harry", "1984", "fantasy", "orwell", "dystopia", "clar"]
+LOGIN = {"username": "john@example.com", "password": "123"}
+
+def _requests(member_id):
+    """Yields (method, path, body) forever in a fixed kiosk-like mix."""
+    while True:
+        yield "GET", f"/books?search={random.choice(SEARCHES)}", None
+        yield "GET", f"/books?search={random.choice(SEARCHES)}", None
+        yield "GET", "/clubs", None
+        yield "GET", f"/books/{random.randint(1, 3)}", None
+        yield "GET", f"/members/{member_id}/loans", None
+
+async def _roundtrip(reader, writer, host, method, path, body, token):
+    """Sends one request on a keep-alive connection; returns (status, raw body)."""
+    data = json.dumps(body).encode() if body is not None else b""
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    req = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n{auth}"
+           f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+    writer.write(req)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _client(host, port, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, raw = await _roundtrip(reader, writer, host, "POST", "/login", LOGIN, None)
+        if status != 200:
+            raise SystemExit(f"login as {LOGIN['username']} failed with {status}: {raw.decode()}")
+        user = json.loads(raw)
+        for method, path, body in _requests(user["member_id"]):
+            if time.perf_counter() >= deadline:
+                break
+            start = time.perf_counter()
+            status, _ = await _roundtrip(reader, writer, host, method, path, body, user["token"])
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def _pct(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+async def run(clients, duration, max_concurrency):
+    pool = await create_async_pool(min_size=max_concurrency, max_size=max_concurrency)
+    server = await ApiServer(pool, max_concurrency).start("127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(host, port, deadline, latencies, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+    await pool.close()
+
+    latencies.sort()
+    print(f"clients={clients} max_concurrency={max_concurrency} duration={elapsed:.1f}s")
+    print(f"requests={len(latencies)} errors={len(errors)} throughput={len(latencies) / elapsed:.0f} req/s")
+    if latencies:
+        print("latency ms: p50={:.2f} p95={:.2f} p99={:.2f} max={:.2f}".format(
+            *(_pct(latencies, p) * 1000 for p in (50, 95, 99)), latencies[-1] * 1000))
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart Library API throughput benchmark")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.duration, args.max_concurrency))
+
+if __name__ == "__main__":
+    main()
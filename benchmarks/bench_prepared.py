@@ -0,0 +1,79 @@
+# benchmarks/bench_prepared.py
+# Latency of the registered hot queries: ad-hoc SQL text vs PREPARE/EXECUTE,
+# against the local PostgreSQL configured in config/database.py.
+#
+#   python -m benchmarks.bench_prepared --iterations 2000
+#
+# Both modes run on the same pooled connection with the same parameters, so the
+# difference is parse + plan time saved by the prepared statement.
+import argparse
+import statistics
+import time
+
+from config.database import pooled_connection
+from dao.statements import statements
+import dao.book_dao, dao.club_dao, dao.loan_dao, dao.user_dao  # noqa: F401  (register statements)
+
+SAMPLES = {
+    "user_login": ("john@example.com", "123"),
+    "book_search": ("%har%",),
+    "member_loans": (1,),
+    "club_list": (),
+}
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+def _summary(samples):
+    return (statistics.mean(samples) * 1000,
+            samples[len(samples) // 2] * 1000,
+            samples[int(len(samples) * 0.95)] * 1000)
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepared vs ad-hoc statement latency")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'statement':<14}{'mode':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        for name, params in SAMPLES.items():
+            def adhoc():
+                statements.execute_adhoc(cur, name, params)
+                cur.fetchall()
+
+            def prepared():
+                statements.execute(cur, name, params)
+                cur.fetchall()
+
+            for fn in (adhoc, prepared):
+                for _ in range(args.warmup):
+                    fn()
+            results = {"adhoc": _time(adhoc, args.iterations), "prepared": _time(prepared, args.iterations)}
+            for mode, samples in results.items():
+                print(f"{name:<14}{mode:<10}" + "".join(f"{v:>10.3f}" for v in _summary(samples)))
+            speedup = statistics.mean(results["adhoc"]) / statistics.mean(results["prepared"])
+            print(f"{name:<14}{'speedup':<10}{speedup:>10.2f}x")
+
+        print("\nregistry stats:")
+        for name, s in statements.stats().items():
+            print(f"  {name:<14} prepares={s['prepares']} executions={s['executions']} "
+                  f"reuse={s['reuse_ratio']:.3f} mean={s['mean_ms']:.3f}ms")
+
+        print("\nserver plan cache (pg_prepared_statements):")
+        for row in statements.server_plan_stats(cur):
+            plans = ""
+            if "generic_plans" in row:
+                plans = f" generic_plans={row['generic_plans']} custom_plans={row['custom_plans']}"
+            print(f"  {row['name']:<14} prepared={row['prepare_time']}{plans}")
+        cur.close()
+
+if __name__ == "__main__":
+    main()
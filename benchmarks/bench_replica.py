@@ -0,0 +1,66 @@
+# benchmarks/bench_replica.py
+# Sync cost and search latency of the local catalog replica against the local
+# PostgreSQL configured in config/database.py.
+#
+#   python -m benchmarks.bench_replica --touch 20 --searches 500
+#
+# Does a full sync into a throwaway SQLite file, an incremental sync with no
+# changes, then touches --touch books on the server and syncs again, printing
+# rows and estimated payload bytes (see _estimate_bytes) for each. Finishes
+# with local vs server search latency.
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from config.database import get_connection
+from dao.book_dao import BookDAO
+from dao.catalog_replica import CatalogReplica
+
+SEARCHES = ["", "harry", "1984", "fantasy", "orwell", "night", "river"]
+
+def _print_sync(label, s):
+    print(f"{label:<22} rows={s['rows']:<6} deleted={s['deleted']:<4} est_bytes={s['est_bytes']:<9} "
+          f"{s['seconds'] * 1000:.1f} ms")
+
+def _touch_books(n):
+    """No-op update on n books: fires the change-log trigger without altering data."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE books SET copies_available = copies_available
+        WHERE book_id IN (SELECT book_id FROM books ORDER BY random() LIMIT %s)
+    """, (n,))
+    conn.commit()
+    cur.close()
+    conn.close()
+
+def _latency(fn, searches):
+    samples = []
+    for i in range(searches):
+        start = time.perf_counter()
+        fn(SEARCHES[i % len(SEARCHES)])
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples) * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog replica sync/search benchmark")
+    parser.add_argument("--touch", type=int, default=20, help="books to change before the incremental sync")
+    parser.add_argument("--searches", type=int, default=500)
+    args = parser.parse_args()
+
+    replica = CatalogReplica(os.path.join(tempfile.mkdtemp(), "catalog.sqlite3"))
+    _print_sync("full sync", replica.sync())
+    _print_sync("incremental (idle)", replica.sync())
+    _touch_books(args.touch)
+    _print_sync(f"incremental ({args.touch} rows)", replica.sync())
+
+    local = _latency(replica.search, args.searches)
+    server = _latency(lambda q: BookDAO.get_available_books(search=q), args.searches)
+    print(f"{'local search':<22} mean={local[0]:.3f} ms p95={local[1]:.3f} ms")
+    print(f"{'server search':<22} mean={server[0]:.3f} ms p95={server[1]:.3f} ms")
+
+if __name__ == "__main__":
+    main()
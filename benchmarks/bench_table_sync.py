@@ -0,0 +1,113 @@
+# benchmarks/bench_table_sync.py
+# Memory and time behaviour of KeyedTableSync (ui/table_sync.py). No database needed.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_table_sync --cycles 10000
+#
+# 1. Runs --cycles refreshes of a catalog-shaped table (one button per row) where
+#    each cycle borrows/returns a few books, adds one and removes one. RSS and the
+#    number of live row buttons are sampled along the way; both should level off.
+# 2. Times one refresh of a --rows table with 0, 1, 10, 100 and 1000 changed rows
+#    against a full rebuild, showing cost follows the number of changed rows.
+# The same properties are asserted in tests/test_table_sync.py; this script only
+# reports the numbers.
+import argparse
+import os
+import random
+import resource
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication, QPushButton, QTableWidget
+
+from ui.table_sync import KeyedTableSync, set_cell
+
+def _rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss   # peak, not current
+
+def _make_table():
+    table = QTableWidget()
+    table.setColumnCount(7)
+
+    def render(i, book):
+        for col, key in enumerate(["book_id", "title", "author_name", "genre", "published_year", "copies_available"]):
+            set_cell(table, i, col, str(book[key]))
+        btn = table.cellWidget(i, 6)
+        if btn is None:
+            btn = QPushButton()
+            btn.clicked.connect(lambda _, bid=book["book_id"]: None)
+            table.setCellWidget(i, 6, btn)
+        btn.setText("Borrow" if book["copies_available"] else "Place Hold")
+
+    return table, KeyedTableSync(table, "book_id", render)
+
+def _books(n, start=0):
+    return [{"book_id": i, "title": f"Book {i}", "author_name": f"Author {i % 97}", "genre": "Fiction",
+             "published_year": 1900 + i % 120, "copies_available": i % 4} for i in range(start, start + n)]
+
+def _flush_deletes():
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QCoreApplication.processEvents()
+
+def memory_cycles(cycles, rows):
+    rng = random.Random(7)
+    table, sync = _make_table()
+    books = _books(rows)
+    next_id = rows
+    print(f"{'cycle':>8}{'rss KB':>12}{'buttons':>10}{'rows':>8}")
+    for cycle in range(cycles + 1):
+        books = [dict(b) for b in books]
+        for b in rng.sample(books, 3):
+            b["copies_available"] = max(0, b["copies_available"] + rng.choice((-1, 1)))
+        books.pop(rng.randrange(len(books)))
+        books.insert(rng.randrange(len(books) + 1), _books(1, next_id)[0])
+        next_id += 1
+        sync.apply(books)
+        if cycle % 100 == 0:
+            _flush_deletes()
+        if cycle % max(1, cycles // 10) == 0:
+            _flush_deletes()
+            buttons = len(table.findChildren(QPushButton))
+            print(f"{cycle:>8}{_rss_kb():>12}{buttons:>10}{table.rowCount():>8}")
+
+def scaling(rows):
+    print(f"\n{'changed':>8}{'diff ms':>12}{'rebuild ms':>12}")
+    for changed in (0, 1, 10, 100, 1000):
+        if changed > rows:
+            break
+        table, sync = _make_table()
+        books = _books(rows)
+        sync.apply(books)
+        updated = [dict(b) for b in books]
+        for b in updated[:changed]:
+            b["title"] += " (2nd ed.)"
+
+        start = time.perf_counter()
+        sync.apply(updated)
+        diff_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        sync.clear()
+        sync.apply(updated)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        print(f"{changed:>8}{diff_ms:>12.2f}{rebuild_ms:>12.2f}")
+        table.deleteLater()
+        _flush_deletes()
+
+def main():
+    parser = argparse.ArgumentParser(description="KeyedTableSync memory/scaling benchmark")
+    parser.add_argument("--cycles", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    memory_cycles(args.cycles, min(args.rows, 500))
+    scaling(args.rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# benchmarks/load_test.py
+# Peak-hour load generator: many virtual users (kiosks and desks) hitting the
+# real DAOs at once against the local PostgreSQL in config/database.py.
+#
+#   python -m benchmarks.load_test --seed --users 200 --processes 8 --duration 60 --scenario peak
+#
+# Virtual users are spread over a process pool and run as threads inside each
+# process (psycopg2 releases the GIL while waiting on the server). Each one logs
+# in, then loops over its scenario's weighted actions with a think time between
+# them. The report has throughput, latency percentiles per action, and error
+# counts by type, with deadlocks and serialization failures shown separately.
+# Every DAO call a virtual user makes (login, search, my loans, issue, return)
+# goes through pooled_connection(), and each process's pool is capped
+# (--pool-size), so all processes together hold at most CONNECTION_BUDGET
+# connections however many users run. Only --seed opens one more.
+import argparse
+import random
+import threading
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+from psycopg2 import errors
+from psycopg2.extras import execute_values
+
+from config.database import POOL_MAX_SIZE, configure_pool, get_connection
+from dao.book_dao import BookDAO
+from dao.loan_dao import LoanDAO
+from dao.user_dao import UserDAO
+from utils.constants import MAX_LOANS
+
+SEED_EMAIL = "lt_member_{}@load.test"
+SEED_PASSWORD = "load"
+SEARCH_TERMS = ["", "the", "night", "river", "garden", "history", "fantasy", "poetry", "war", "lost"]
+CONNECTION_BUDGET = 80   # pooled connections across all processes; PostgreSQL allows 100 by default
+
+# weights per action, think time range in seconds
+SCENARIOS = {
+    "peak":   {"weights": {"search": 6, "borrow": 2, "return": 2, "login": 1}, "think": (0.5, 2.0)},
+    "kiosk":  {"weights": {"search": 8, "borrow": 1, "return": 0, "login": 1}, "think": (1.0, 3.0)},
+    "desk":   {"weights": {"search": 1, "borrow": 3, "return": 4, "login": 0}, "think": (0.2, 1.0)},
+    "stress": {"weights": {"search": 4, "borrow": 3, "return": 3, "login": 1}, "think": (0.0, 0.0)},
+}
+
+# ────────────────────── SEEDING ──────────────────────
+def seed(members, books):
+    """Creates synthetic members/users/books once; reruns only top up what is missing."""
+    rng = random.Random(42)
+    words = ["Night", "River", "Garden", "History", "Lost", "War", "Silent", "Crown", "Glass",
+             "Winter", "Poetry", "City", "Storm", "Shadow", "Empire", "Ocean", "Fantasy", "Iron"]
+    genres = ["Fiction", "Fantasy", "History", "Poetry", "Science", "Mystery", "Dystopia"]
+
+    conn = get_connection()
+    cur = conn.cursor()
+    execute_values(cur, "INSERT INTO authors (name) VALUES %s ON CONFLICT (name) DO NOTHING",
+                   [(f"LT Author {i}",) for i in range(50)])
+    cur.execute("SELECT author_id FROM authors WHERE name LIKE 'LT Author %%'")
+    author_ids = [r['author_id'] for r in cur.fetchall()]
+
+    execute_values(cur, "INSERT INTO members (full_name, email) VALUES %s ON CONFLICT (email) DO NOTHING",
+                   [(f"Load Member {i}", SEED_EMAIL.format(i)) for i in range(members)])
+    execute_values(cur, "INSERT INTO users (username, password, role) VALUES %s ON CONFLICT (username) DO NOTHING",
+                   [(SEED_EMAIL.format(i), SEED_PASSWORD, "Member") for i in range(members)])
+
+    rows = []
+    for i in range(books):
+        copies = rng.randint(1, 5)
+        title = " ".join(rng.sample(words, 3))
+        rows.append((f"LT{i:010d}", title, rng.choice(author_ids), rng.choice(genres),
+                     rng.randint(1900, 2025), copies, copies))
+    execute_values(cur, """
+        INSERT INTO books (isbn, title, author_id, genre, published_year, copies_total, copies_available)
+        VALUES %s ON CONFLICT (isbn) DO NOTHING
+    """, rows)
+    conn.commit()
+    cur.close()
+    conn.close()
+
+# ────────────────────── VIRTUAL USERS ──────────────────────
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)   # action -> [seconds]
+        self.errors = defaultdict(int)       # "action:ErrorType" -> count
+        self.lock = threading.Lock()
+
+    def record(self, action, seconds, error=None):
+        with self.lock:
+            if error is None:
+                self.latencies[action].append(seconds)
+            else:
+                self.errors[f"{action}:{type(error).__name__}"] += 1
+
+def _timed(stats, action, fn, *args):
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        stats.record(action, time.perf_counter() - start, e)
+        return None
+    stats.record(action, time.perf_counter() - start)
+    return result
+
+def virtual_user(vu_id, scenario, members, deadline, stats):
+    rng = random.Random(vu_id)
+    actions = list(scenario["weights"])
+    weights = [scenario["weights"][a] for a in actions]
+    think_lo, think_hi = scenario["think"]
+    email = SEED_EMAIL.format(vu_id % members)
+
+    user = _timed(stats, "login", _login, email)
+    if not user:
+        return
+    member_id = user.member_id
+
+    while time.time() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if action == "login":
+            _timed(stats, "login", _login, email)
+        elif action == "search":
+            _timed(stats, "search", BookDAO.get_available_books, rng.choice(SEARCH_TERMS))
+        elif action == "borrow":
+            # Own label, so borrow's searches do not skew the plain search percentiles.
+            books = _timed(stats, "borrow_search", BookDAO.get_available_books, rng.choice(SEARCH_TERMS)) or []
+            books = [b for b in books if b["copies_available"] > 0]
+            loans = _timed(stats, "my_loans", LoanDAO.get_member_loans, member_id) or []
+            if books and len(loans) < MAX_LOANS:
+                _timed(stats, "borrow", _borrow, rng.choice(books)["book_id"], member_id)
+        elif action == "return":
+            loans = _timed(stats, "my_loans", LoanDAO.get_member_loans, member_id) or []
+            if loans:
+                _timed(stats, "return", LoanDAO.return_loan, rng.choice(loans)["loan_id"])
+        if think_hi:
+            time.sleep(rng.uniform(think_lo, think_hi))
+
+class LoginFailed(Exception):
+    """No such seeded user (run with --seed, or lower --members)."""
+
+def _login(email):
+    user = UserDAO.login(email, SEED_PASSWORD)
+    if not user:
+        raise LoginFailed(email)
+    return user
+
+class NoCopy(Exception):
+    """Lost the race for the last copy (issue_loan returned False)."""
+
+def _borrow(book_id, member_id):
+    if not LoanDAO.issue_loan(book_id, member_id):
+        raise NoCopy()
+    return True
+
+def run_process(args):
+    """Runs a slice of the virtual users as threads; deadline is wall-clock (time.time())."""
+    first_vu, count, scenario_name, members, deadline = args
+    stats = Stats()
+    threads = [threading.Thread(target=virtual_user,
+                                args=(vu, SCENARIOS[scenario_name], members, deadline, stats))
+               for vu in range(first_vu, first_vu + count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return dict(stats.latencies), dict(stats.errors)
+
+# ────────────────────── REPORT ──────────────────────
+def _pct(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+def report(latencies, errs, elapsed, users, processes, pool_size, scenario):
+    total = sum(len(v) for v in latencies.values())
+    print(f"scenario={scenario} users={users} processes={processes} pool_size={pool_size} "
+          f"elapsed={elapsed:.1f}s")
+    print(f"ok={total} errors={sum(errs.values())} throughput={total / elapsed:.1f} ops/s")
+    print(f"{'action':<14}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action in sorted(latencies):
+        values = sorted(latencies[action])
+        if not values:
+            continue
+        print(f"{action:<14}{len(values):>8}" + "".join(
+            f"{_pct(values, p) * 1000:>10.1f}" for p in (50, 95, 99)) + f"{values[-1] * 1000:>10.1f}")
+
+    deadlocks = sum(n for k, n in errs.items() if k.endswith(":" + errors.DeadlockDetected.__name__))
+    serialization = sum(n for k, n in errs.items() if k.endswith(":" + errors.SerializationFailure.__name__))
+    print(f"deadlocks={deadlocks} serialization_failures={serialization}")
+    for key in sorted(errs):
+        print(f"  {key}: {errs[key]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart Library concurrent load generator")
+    parser.add_argument("--users", type=int, default=200, help="virtual users in total")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="peak")
+    parser.add_argument("--seed", action="store_true", help="create synthetic members/books first")
+    parser.add_argument("--members", type=int, default=500, help="synthetic members to seed / log in as")
+    parser.add_argument("--books", type=int, default=2000, help="synthetic books to seed")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help=f"pooled connections per process (default: {CONNECTION_BUDGET} split "
+                             f"over the processes, at most {POOL_MAX_SIZE})")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.members, args.books)
+
+    processes = max(1, min(args.processes, args.users))
+    pool_size = args.pool_size or max(1, min(POOL_MAX_SIZE, CONNECTION_BUDGET // processes))
+    per_proc, extra = divmod(args.users, processes)
+    start = time.time()
+    deadline = start + args.duration
+    jobs, first = [], 0
+    for p in range(processes):
+        count = per_proc + (1 if p < extra else 0)
+        jobs.append((first, count, args.scenario, args.members, deadline))
+        first += count
+
+    with Pool(processes, initializer=configure_pool, initargs=(pool_size,)) as pool:
+        results = pool.map(run_process, jobs)
+    elapsed = time.time() - start
+
+    latencies, errs = defaultdict(list), defaultdict(int)
+    for lat, err in results:
+        for k, v in lat.items():
+            latencies[k].extend(v)
+        for k, n in err.items():
+            errs[k] += n
+    report(latencies, errs, elapsed, args.users, processes, pool_size, args.scenario)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,86 @@
+import threading
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2.extensions import connection as _pg_connection
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+DB_SETTINGS = {
+    "dbname": "smart_library",
+    "user": "postgres",        # change if you set a different user
+    "password": "STEVRINA",    # change to whatever you set during install
+    "host": "localhost",
+    "port": "5432",
+}
 
 def get_connection():
-    return psycopg2.connect(
-        dbname="smart_library",
-        user="postgres",        # change if you set a different user
-        password="STEVRINA", # change to whatever you set during install
-        host="localhost",
-        port="5432",
-        cursor_factory=RealDictCursor
+    return psycopg2.connect(cursor_factory=RealDictCursor, **DB_SETTINGS)
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 20
+
+class PooledConnection(_pg_connection):
+    """Connection that remembers which registry statements it has PREPAREd."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_SIZE)
+
+def configure_pool(max_size):
+    """Changes POOL_MAX_SIZE. Call before the pool is first used, e.g. once in each
+    worker process so several processes together stay under max_connections."""
+    global POOL_MAX_SIZE, _pool_slots
+    with _pool_lock:
+        if _pool is not None:
+            raise RuntimeError("configure_pool() must run before the first pooled_connection()")
+        POOL_MAX_SIZE = max_size
+        _pool_slots = threading.BoundedSemaphore(max_size)
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    POOL_MIN_SIZE, POOL_MAX_SIZE,
+                    connection_factory=PooledConnection,
+                    cursor_factory=RealDictCursor,
+                    **DB_SETTINGS
+                )
+    return _pool
+
+@contextmanager
+def pooled_connection():
+    """Borrows a long-lived connection (commit on success, rollback on error).
+
+    Blocks while all POOL_MAX_SIZE connections are in use instead of raising PoolError.
+    """
+    pool = _get_pool()
+    with _pool_slots:
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+
+async def create_async_pool(min_size=2, max_size=20):
+    # asyncpg is only needed for the headless server (main.py --serve)
+    import asyncpg
+    return await asyncpg.create_pool(
+        database=DB_SETTINGS["dbname"],
+        user=DB_SETTINGS["user"],
+        password=DB_SETTINGS["password"],
+        host=DB_SETTINGS["host"],
+        port=int(DB_SETTINGS["port"]),
+        min_size=min_size,
+        max_size=max_size,
     )
\ No newline at end of file
@@ -0,0 +1,179 @@
+# dao/async_dao.py
+# asyncpg counterparts of the DAOs, used by the headless server (api/server.py).
+# Every method takes the shared pool as its first argument and returns plain dicts
+# shaped like the sync DAOs' RealDictCursor rows.
+from utils.constants import LOAN_DAYS, MAX_LOANS
+
+class _Refused(Exception):
+    """Raised inside a transaction block to roll it back and return None."""
+
+def _rows(records):
+    return [dict(r) for r in records]
+
+async def _lock_member_loans(conn, member_id, book_id):
+    """Same as dao.loan_dao._lock_member_loans: book first, then member."""
+    await conn.execute("SELECT 1 FROM members WHERE member_id = $1 FOR NO KEY UPDATE", member_id)
+    row = await conn.fetchrow("""
+        SELECT COUNT(*) AS open_loans, COUNT(*) FILTER (WHERE book_id = $2) AS this_book
+        FROM loans
+        WHERE member_id = $1 AND return_date IS NULL
+    """, member_id, book_id)
+    return row['open_loans'], row['this_book']
+
+class AsyncUserDAO:
+    @staticmethod
+    async def login(pool, username, password):
+        row = await pool.fetchrow("""
+            SELECT u.user_id, u.username, u.role, m.member_id
+            FROM users u
+            LEFT JOIN members m ON LOWER(u.username) = LOWER(m.email)
+            WHERE LOWER(u.username) = LOWER($1) AND u.password = $2
+        """, username, password)
+        return dict(row) if row else None
+
+class AsyncBookDAO:
+    @staticmethod
+    async def get_available_books(pool, search=""):
+        pattern = f"%{search}%"
+        return _rows(await pool.fetch("""
+            SELECT b.book_id, b.title, COALESCE(a.name, 'Unknown') AS author_name,
+                   b.genre, b.published_year, b.copies_available
+            FROM books b
+            LEFT JOIN authors a ON a.author_id = b.author_id
+            WHERE b.title ILIKE $1 OR a.name ILIKE $1 OR b.genre ILIKE $1
+            ORDER BY b.title
+        """, pattern))
+
+    @staticmethod
+    async def get_book(pool, book_id):
+        row = await pool.fetchrow("""
+            SELECT b.book_id, COALESCE(b.isbn, '') AS isbn, b.title,
+                   COALESCE(a.name, 'Unknown') AS author_name,
+                   COALESCE(b.genre, '') AS genre, b.published_year,
+                   b.copies_total, b.copies_available
+            FROM books b
+            LEFT JOIN authors a ON a.author_id = b.author_id
+            WHERE b.book_id = $1
+        """, book_id)
+        return dict(row) if row else None
+
+class AsyncLoanDAO:
+    @staticmethod
+    async def get_member_loans(pool, member_id):
+        return _rows(await pool.fetch("""
+            SELECT l.loan_id, l.book_id, b.title, l.loan_date, l.due_date
+            FROM loans l
+            JOIN books b ON b.book_id = l.book_id
+            WHERE l.member_id = $1 AND l.return_date IS NULL
+            ORDER BY l.due_date
+        """, member_id))
+
+    @staticmethod
+    async def issue_loan(pool, book_id, member_id):
+        """Returns the new loan_id, or None if no copy is free, the member is at
+        MAX_LOANS or already has this title out."""
+        async with pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    taken = await conn.fetchval("""
+                        UPDATE books SET copies_available = copies_available - 1
+                        WHERE book_id = $1 AND copies_available > 0
+                        RETURNING book_id
+                    """, book_id)
+                    if taken is None:
+                        raise _Refused
+                    open_loans, this_book = await _lock_member_loans(conn, member_id, book_id)
+                    if open_loans >= MAX_LOANS or this_book:
+                        raise _Refused
+                    return await conn.fetchval("""
+                        INSERT INTO loans (book_id, member_id, due_date)
+                        VALUES ($1, $2, CURRENT_DATE + $3::int)
+                        RETURNING loan_id
+                    """, book_id, member_id, LOAN_DAYS)
+            except _Refused:
+                return None
+
+    @staticmethod
+    async def return_loan(pool, loan_id, member_id=None):
+        """Same contract as LoanDAO.return_loan. With member_id, only that
+        member's loan is returned."""
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                book_id = await conn.fetchval("""
+                    UPDATE loans SET return_date = CURRENT_DATE
+                    WHERE loan_id = $1 AND return_date IS NULL
+                      AND ($2::int IS NULL OR member_id = $2)
+                    RETURNING book_id
+                """, loan_id, member_id)
+                if book_id is None:
+                    return None
+
+                await conn.execute("SELECT 1 FROM books WHERE book_id = $1 FOR NO KEY UPDATE", book_id)
+                after = 0   # seek past passed-over holds, see LoanDAO.return_loan
+                while True:
+                    hold = await conn.fetchrow("""
+                        SELECT hold_id, member_id
+                        FROM holds
+                        WHERE book_id = $1 AND status = 'Waiting' AND hold_id > $2
+                        ORDER BY hold_id
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    """, book_id, after)
+                    if not hold:
+                        break
+                    candidate = conn.transaction()   # savepoint, see LoanDAO.return_loan
+                    await candidate.start()
+                    open_loans, this_book = await _lock_member_loans(conn, hold['member_id'], book_id)
+                    if open_loans < MAX_LOANS and not this_book:
+                        await candidate.commit()
+                        break
+                    await candidate.rollback()
+                    if this_book:
+                        await conn.execute("UPDATE holds SET status = 'Cancelled' WHERE hold_id = $1",
+                                           hold['hold_id'])
+                    after = hold['hold_id']
+
+                result = {"book_id": book_id, "next_member_id": None, "next_loan_id": None}
+                if hold:
+                    next_loan_id = await conn.fetchval("""
+                        INSERT INTO loans (book_id, member_id, due_date)
+                        VALUES ($1, $2, CURRENT_DATE + $3::int)
+                        RETURNING loan_id
+                    """, book_id, hold['member_id'], LOAN_DAYS)
+                    await conn.execute("""
+                        UPDATE holds SET status = 'Fulfilled', loan_id = $1
+                        WHERE hold_id = $2
+                    """, next_loan_id, hold['hold_id'])
+                    result["next_member_id"] = hold['member_id']
+                    result["next_loan_id"] = next_loan_id
+                else:
+                    await conn.execute("""
+                        UPDATE books SET copies_available = copies_available + 1
+                        WHERE book_id = $1
+                    """, book_id)
+                return result
+
+class AsyncClubDAO:
+    @staticmethod
+    async def get_all_clubs(pool):
+        return _rows(await pool.fetch("""
+            SELECT club_id, name, description, created_date, member_count
+            FROM book_clubs
+            ORDER BY name
+        """))
+
+    @staticmethod
+    async def join_club(pool, club_id, member_id):
+        status = await pool.execute("""
+            INSERT INTO club_membership (club_id, member_id)
+            VALUES ($1, $2)
+            ON CONFLICT (club_id, member_id) DO NOTHING
+        """, club_id, member_id)
+        return status == "INSERT 0 1"
+
+    @staticmethod
+    async def leave_club(pool, club_id, member_id):
+        status = await pool.execute(
+            "DELETE FROM club_membership WHERE club_id = $1 AND member_id = $2",
+            club_id, member_id)
+        return status == "DELETE 1"
@@ -0,0 +1,20 @@
+# dao/author_dao.py
+from config.database import get_connection
+
+class AuthorDAO:
+    @staticmethod
+    def get_or_create(name):
+        conn = get_connection()
+        cur = conn.cursor()
+        # The no-op update makes RETURNING yield the id for an existing author too.
+        cur.execute("""
+            INSERT INTO authors (name)
+            VALUES (%s)
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING author_id
+        """, (name,))
+        author_id = cur.fetchone()['author_id']
+        conn.commit()
+        cur.close()
+        conn.close()
+        return author_id
@@ -0,0 +1,54 @@
+# dao/book_dao.py
+from config.database import get_connection, pooled_connection
+from dao.statements import statements
+
+statements.register("book_search", ("text",), """
+    SELECT b.book_id, b.title, COALESCE(a.name, 'Unknown') AS author_name,
+           b.genre, b.published_year, b.copies_available
+    FROM books b
+    LEFT JOIN authors a ON a.author_id = b.author_id
+    WHERE b.title ILIKE $1 OR a.name ILIKE $1 OR b.genre ILIKE $1
+    ORDER BY b.title
+""")
+
+class BookDAO:
+    @staticmethod
+    def get_all_books():
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT b.book_id, COALESCE(b.isbn, '') AS isbn, b.title,
+                   COALESCE(a.name, 'Unknown') AS author_name,
+                   COALESCE(b.genre, '') AS genre, b.published_year, b.copies_total, b.copies_available
+            FROM books b
+            LEFT JOIN authors a ON a.author_id = b.author_id
+            ORDER BY b.title
+        """)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def get_available_books(search=""):
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            statements.execute(cur, "book_search", (f"%{search}%",))
+            rows = cur.fetchall()
+            cur.close()
+        return rows
+
+    @staticmethod
+    def add_book(title, author_id=None, isbn=None, genre=None, published_year=None, copies_available=1):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO books (isbn, title, author_id, genre, published_year, copies_total, copies_available)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            RETURNING book_id
+        """, (isbn, title, author_id, genre, published_year, copies_available, copies_available))
+        book_id = cur.fetchone()['book_id']
+        conn.commit()
+        cur.close()
+        conn.close()
+        return book_id
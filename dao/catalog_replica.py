@@ -0,0 +1,216 @@
+# dao/catalog_replica.py
+# Local SQLite copy of books/authors for member workstations. Searches run
+# locally; sync() pulls only rows changed since the last watermark (see the
+# catalog_changes log in database/sql.sql). Borrowing still goes to the server
+# through LoanDAO; call request_sync() afterwards to pick up the new counts.
+# prune_change_log() keeps that log bounded on the server side.
+import os
+import sqlite3
+import threading
+import time
+
+import psycopg2.extensions
+
+from config.database import get_connection
+from utils.constants import CATALOG_CHANGE_RETENTION_DAYS, CATALOG_REPLICA_PATH, CATALOG_SYNC_SECONDS
+
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    author_id   INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS books (
+    book_id          INTEGER PRIMARY KEY,
+    isbn             TEXT,
+    title            TEXT NOT NULL,
+    author_id        INTEGER,
+    genre            TEXT,
+    published_year   INTEGER,
+    copies_total     INTEGER,
+    copies_available INTEGER
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+BOOK_COLUMNS = ("book_id", "isbn", "title", "author_id", "genre",
+                "published_year", "copies_total", "copies_available")
+
+def _estimate_bytes(rows):
+    """Estimated size of the row data pulled from the server: the text form of every
+    non-null value. Protocol framing and column headers are not counted."""
+    return sum(len(str(v).encode()) for row in rows for v in row.values() if v is not None)
+
+def prune_change_log(retain_days=CATALOG_CHANGE_RETENTION_DAYS):
+    """Deletes catalog_changes entries older than retain_days. Returns how many went."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT prune_catalog_changes(make_interval(days => %s)) AS pruned", (retain_days,))
+    pruned = cur.fetchone()['pruned']
+    conn.commit()
+    cur.close()
+    conn.close()
+    return pruned
+
+class CatalogReplica:
+    def __init__(self, path=CATALOG_REPLICA_PATH):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # One connection for searches on the GUI thread; sync() opens its own.
+        # WAL lets a background sync write while searches keep reading.
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(LOCAL_SCHEMA)
+        self.db.commit()
+
+        self.generation = 0            # bumped whenever a sync changes local rows
+        self.last_sync = None          # stats of the last successful sync
+        self.last_error = None
+        self.total_sync_est_bytes = 0
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ────────────────────── LOCAL READS ──────────────────────
+    def search(self, search=""):
+        """Same rows as BookDAO.get_available_books, served from the local store."""
+        pattern = f"%{search}%"
+        start = time.perf_counter()
+        rows = self.db.execute("""
+            SELECT b.book_id, b.title, COALESCE(a.name, 'Unknown') AS author_name,
+                   b.genre, b.published_year, b.copies_available
+            FROM books b
+            LEFT JOIN authors a ON a.author_id = b.author_id
+            WHERE b.title LIKE ? OR a.name LIKE ? OR b.genre LIKE ?
+            ORDER BY b.title COLLATE NOCASE
+        """, (pattern, pattern, pattern)).fetchall()
+        self.query_seconds += time.perf_counter() - start
+        self.query_count += 1
+        return [dict(r) for r in rows]
+
+    def is_empty(self):
+        return self.db.execute("SELECT 1 FROM sync_state WHERE key = 'watermark'").fetchone() is None
+
+    def stats(self):
+        return {
+            "last_sync": self.last_sync,
+            "last_error": self.last_error,
+            "total_sync_est_bytes": self.total_sync_est_bytes,
+            "local_queries": self.query_count,
+            "local_query_mean_ms": self.query_seconds * 1000 / self.query_count if self.query_count else 0.0,
+        }
+
+    # ────────────────────── SYNC ──────────────────────
+    def sync(self):
+        """Pulls changes from the server. Returns this sync's stats; raises on connection errors."""
+        with self._sync_lock:
+            local = sqlite3.connect(self.path)
+            try:
+                return self._sync(local)
+            finally:
+                local.close()
+
+    def _sync(self, local):
+        start = time.perf_counter()
+        row = local.execute("SELECT value FROM sync_state WHERE key = 'watermark'").fetchone()
+        watermark = int(row[0]) if row else None
+
+        conn = get_connection()
+        # One snapshot for the watermark, the change log and the rows, so nothing
+        # committed between those reads can slip past.
+        conn.set_session(isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT txid_snapshot_xmin(txid_current_snapshot()) AS xmin,
+                   (SELECT txid FROM catalog_sync_horizon) AS horizon
+        """)
+        row = cur.fetchone()
+        new_watermark = row['xmin']
+        if watermark is not None and watermark < (row['horizon'] or 0):
+            watermark = None   # changes we never saw have been pruned from the log
+
+        if watermark is None:
+            cur.execute("SELECT author_id, name FROM authors")
+            authors = cur.fetchall()
+            cur.execute(f"SELECT {', '.join(BOOK_COLUMNS)} FROM books")
+            books = cur.fetchall()
+            author_ids = book_ids = None
+        else:
+            cur.execute("""
+                SELECT DISTINCT table_name, row_id FROM catalog_changes WHERE txid >= %s
+            """, (watermark,))
+            changes = cur.fetchall()
+            author_ids = [c['row_id'] for c in changes if c['table_name'] == 'authors']
+            book_ids = [c['row_id'] for c in changes if c['table_name'] == 'books']
+            authors, books = [], []
+            if author_ids:
+                cur.execute("SELECT author_id, name FROM authors WHERE author_id = ANY(%s)", (author_ids,))
+                authors = cur.fetchall()
+            if book_ids:
+                cur.execute(f"SELECT {', '.join(BOOK_COLUMNS)} FROM books WHERE book_id = ANY(%s)", (book_ids,))
+                books = cur.fetchall()
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+        deleted = 0
+        with local:
+            if watermark is None:
+                local.execute("DELETE FROM authors")
+                local.execute("DELETE FROM books")
+            else:
+                # Changed ids that no longer exist on the server were deleted there.
+                gone = set(author_ids) - {a['author_id'] for a in authors}
+                local.executemany("DELETE FROM authors WHERE author_id = ?", [(i,) for i in gone])
+                deleted += len(gone)
+                gone = set(book_ids) - {b['book_id'] for b in books}
+                local.executemany("DELETE FROM books WHERE book_id = ?", [(i,) for i in gone])
+                deleted += len(gone)
+            local.executemany("INSERT OR REPLACE INTO authors (author_id, name) VALUES (?, ?)",
+                              [(a['author_id'], a['name']) for a in authors])
+            local.executemany(
+                f"INSERT OR REPLACE INTO books ({', '.join(BOOK_COLUMNS)}) VALUES ({', '.join('?' * len(BOOK_COLUMNS))})",
+                [tuple(b[c] for c in BOOK_COLUMNS) for b in books])
+            local.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('watermark', ?)",
+                          (str(new_watermark),))
+
+        rows = len(authors) + len(books)
+        est_bytes = _estimate_bytes(authors) + _estimate_bytes(books)
+        if rows or deleted or watermark is None:
+            self.generation += 1
+        self.total_sync_est_bytes += est_bytes
+        self.last_error = None
+        self.last_sync = {
+            "full": watermark is None,
+            "rows": rows,
+            "deleted": deleted,
+            "est_bytes": est_bytes,
+            "seconds": time.perf_counter() - start,
+            "at": time.strftime("%H:%M:%S"),
+        }
+        return self.last_sync
+
+    # ────────────────────── BACKGROUND ──────────────────────
+    def start_background_sync(self, interval=CATALOG_SYNC_SECONDS):
+        """Syncs every interval seconds (or sooner after request_sync) on a daemon thread."""
+        if self._thread:
+            return
+        def loop():
+            while True:
+                try:
+                    self.sync()
+                except Exception as e:
+                    # Offline: keep serving the local copy and try again later.
+                    self.last_error = str(e)
+                self._wake.wait(interval)
+                self._wake.clear()
+        self._thread = threading.Thread(target=loop, name="catalog-sync", daemon=True)
+        self._thread.start()
+
+    def request_sync(self):
+        self._wake.set()
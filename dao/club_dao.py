@@ -0,0 +1,107 @@
+# dao/club_dao.py
+from config.database import get_connection, pooled_connection
+from dao.statements import statements
+
+# member_count is maintained by triggers on club_membership (see database/sql.sql),
+# so listing clubs never aggregates the membership table.
+statements.register("club_list", (), """
+    SELECT club_id, name, description, created_date, member_count
+    FROM book_clubs
+    ORDER BY name
+""")
+
+class ClubDAO:
+    @staticmethod
+    def get_all_clubs():
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            statements.execute(cur, "club_list")
+            rows = cur.fetchall()
+            cur.close()
+        return rows
+
+    @staticmethod
+    def get_member_club_ids(member_id):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT club_id FROM club_membership WHERE member_id = %s", (member_id,))
+        ids = {row['club_id'] for row in cur.fetchall()}
+        cur.close()
+        conn.close()
+        return ids
+
+    @staticmethod
+    def create_club(name, description=None):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO book_clubs (name, description)
+            VALUES (%s, %s)
+            RETURNING club_id
+        """, (name, description))
+        club_id = cur.fetchone()['club_id']
+        conn.commit()
+        cur.close()
+        conn.close()
+        return club_id
+
+    @staticmethod
+    def delete_club(club_id):
+        conn = get_connection()
+        cur = conn.cursor()
+        # Memberships go with the club via ON DELETE CASCADE.
+        cur.execute("DELETE FROM book_clubs WHERE club_id = %s", (club_id,))
+        deleted = cur.rowcount == 1
+        conn.commit()
+        cur.close()
+        conn.close()
+        return deleted
+
+    @staticmethod
+    def join_club(club_id, member_id):
+        """Returns True if the member was added, False if they already belonged."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO club_membership (club_id, member_id)
+            VALUES (%s, %s)
+            ON CONFLICT (club_id, member_id) DO NOTHING
+        """, (club_id, member_id))
+        joined = cur.rowcount == 1
+        conn.commit()
+        cur.close()
+        conn.close()
+        return joined
+
+    @staticmethod
+    def leave_club(club_id, member_id):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM club_membership WHERE club_id = %s AND member_id = %s",
+                    (club_id, member_id))
+        left = cur.rowcount == 1
+        conn.commit()
+        cur.close()
+        conn.close()
+        return left
+
+    @staticmethod
+    def bulk_join(club_id, member_ids):
+        """Enrolls many members in one statement. Returns how many were newly added."""
+        member_ids = sorted({int(m) for m in member_ids})
+        if not member_ids:
+            return 0
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO club_membership (club_id, member_id)
+            SELECT %s, m.member_id
+            FROM members m
+            WHERE m.member_id = ANY(%s)
+            ON CONFLICT (club_id, member_id) DO NOTHING
+        """, (club_id, member_ids))
+        added = cur.rowcount
+        conn.commit()
+        cur.close()
+        conn.close()
+        return added
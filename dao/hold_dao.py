@@ -0,0 +1,90 @@
+# dao/hold_dao.py
+from psycopg2 import errors
+from config.database import get_connection
+from utils.constants import HOLD_POSITION_CAP
+
+class HoldDAO:
+    @staticmethod
+    def place_hold(book_id, member_id):
+        """Joins the book's queue. Returns the hold_id, or None if a copy is on the
+        shelf (borrow it instead), the member already has this title out, or the
+        member is already waiting."""
+        conn = get_connection()
+        cur = conn.cursor()
+        # FOR SHARE: many members can queue at once, but not while a return of
+        # this title is deciding whether the copy goes back on the shelf.
+        cur.execute("SELECT copies_available FROM books WHERE book_id = %s FOR SHARE", (book_id,))
+        book = cur.fetchone()
+        if not book or book['copies_available'] > 0:
+            conn.rollback()
+            cur.close()
+            conn.close()
+            return None
+        # Holding the book lock, this cannot race an issue or hand-off of the title.
+        cur.execute("""
+            SELECT 1 FROM loans
+            WHERE book_id = %s AND member_id = %s AND return_date IS NULL
+        """, (book_id, member_id))
+        if cur.fetchone():
+            conn.rollback()
+            cur.close()
+            conn.close()
+            return None
+        try:
+            cur.execute("""
+                INSERT INTO holds (book_id, member_id)
+                VALUES (%s, %s)
+                RETURNING hold_id
+            """, (book_id, member_id))
+        except errors.UniqueViolation:
+            conn.rollback()
+            cur.close()
+            conn.close()
+            return None
+        hold_id = cur.fetchone()['hold_id']
+        conn.commit()
+        cur.close()
+        conn.close()
+        return hold_id
+
+    @staticmethod
+    def cancel_hold(hold_id, member_id):
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE holds SET status = 'Cancelled'
+            WHERE hold_id = %s AND member_id = %s AND status = 'Waiting'
+        """, (hold_id, member_id))
+        cancelled = cur.rowcount == 1
+        conn.commit()
+        cur.close()
+        conn.close()
+        return cancelled
+
+    @staticmethod
+    def get_member_holds(member_id):
+        """Waiting holds for a member with their 1-based queue position.
+
+        position stops counting at HOLD_POSITION_CAP + 1, meaning "that far back
+        or further": each hold costs at most HOLD_POSITION_CAP steps along
+        idx_holds_queue, however long the queue, since the member dashboard
+        calls this on every refresh.
+        """
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT h.hold_id, h.book_id, b.title, h.placed_at,
+                   (SELECT COUNT(*) FROM (
+                        SELECT 1 FROM holds q
+                        WHERE q.book_id = h.book_id AND q.status = 'Waiting'
+                          AND q.hold_id < h.hold_id
+                        LIMIT %s) ahead) + 1 AS position
+            FROM holds h
+            JOIN books b ON b.book_id = h.book_id
+            WHERE h.member_id = %s AND h.status = 'Waiting'
+            ORDER BY h.placed_at
+        """, (HOLD_POSITION_CAP, member_id))
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return rows
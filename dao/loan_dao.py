@@ -0,0 +1,176 @@
+# dao/loan_dao.py
+from config.database import get_connection, pooled_connection
+from dao.statements import statements
+from utils.constants import LOAN_DAYS, MAX_LOANS
+
+statements.register("member_loans", ("int",), """
+    SELECT l.loan_id, l.book_id, b.title, l.loan_date, l.due_date
+    FROM loans l
+    JOIN books b ON b.book_id = l.book_id
+    WHERE l.member_id = $1 AND l.return_date IS NULL
+    ORDER BY l.due_date
+""")
+
+def _lock_member_loans(cur, member_id, book_id):
+    """Locks the member and returns (open loans, open loans of book_id).
+
+    Callers lock the book first and the member second, so issuing and the hold
+    hand-off cannot deadlock, and two of them cannot both push one member
+    past MAX_LOANS.
+    """
+    cur.execute("SELECT 1 FROM members WHERE member_id = %s FOR NO KEY UPDATE", (member_id,))
+    cur.execute("""
+        SELECT COUNT(*) AS open_loans, COUNT(*) FILTER (WHERE book_id = %s) AS this_book
+        FROM loans
+        WHERE member_id = %s AND return_date IS NULL
+    """, (book_id, member_id))
+    row = cur.fetchone()
+    return row['open_loans'], row['this_book']
+
+class LoanDAO:
+    @staticmethod
+    def get_member_loans(member_id):
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            statements.execute(cur, "member_loans", (member_id,))
+            rows = cur.fetchall()
+            cur.close()
+        return rows
+
+    @staticmethod
+    def get_active_loans():
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT l.loan_id, l.book_id, b.title, m.full_name AS member_name,
+                   l.loan_date, l.due_date
+            FROM loans l
+            JOIN books b ON b.book_id = l.book_id
+            JOIN members m ON m.member_id = l.member_id
+            WHERE l.return_date IS NULL
+            ORDER BY l.due_date
+        """)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def get_overdue_loans():
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT l.loan_id, l.book_id, b.title, m.full_name AS member_name,
+                   l.loan_date, l.due_date
+            FROM loans l
+            JOIN books b ON b.book_id = l.book_id
+            JOIN members m ON m.member_id = l.member_id
+            WHERE l.return_date IS NULL AND l.due_date < CURRENT_DATE
+            ORDER BY l.due_date
+        """)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def issue_loan(book_id, member_id):
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            # Take the copy and create the loan in one transaction; the guard on
+            # copies_available makes two members racing for the last copy safe.
+            cur.execute("""
+                UPDATE books SET copies_available = copies_available - 1
+                WHERE book_id = %s AND copies_available > 0
+            """, (book_id,))
+            issued = cur.rowcount == 1
+            if issued:
+                open_loans, this_book = _lock_member_loans(cur, member_id, book_id)
+                issued = open_loans < MAX_LOANS and not this_book
+            if issued:
+                cur.execute("""
+                    INSERT INTO loans (book_id, member_id, due_date)
+                    VALUES (%s, %s, CURRENT_DATE + %s)
+                """, (book_id, member_id, LOAN_DAYS))
+            else:
+                conn.rollback()
+            cur.close()
+        return issued
+
+    @staticmethod
+    def return_loan(loan_id):
+        """Closes a loan and hands the copy to the next eligible member waiting on a hold.
+
+        A waiting member already at MAX_LOANS keeps their place for a later copy;
+        one who already has this title out has the hold cancelled. Returns
+        {"book_id", "next_member_id", "next_loan_id"} (the last two are None when
+        nobody eligible is waiting), or None if the loan was not active.
+        """
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                UPDATE loans SET return_date = CURRENT_DATE
+                WHERE loan_id = %s AND return_date IS NULL
+                RETURNING book_id
+            """, (loan_id,))
+            row = cur.fetchone()
+            if not row:
+                cur.close()
+                return None
+            book_id = row['book_id']
+
+            # Lock the book before looking at the queue so a hold being placed
+            # concurrently (HoldDAO.place_hold takes FOR SHARE) is either seen here
+            # or sees the copy come back.
+            cur.execute("SELECT 1 FROM books WHERE book_id = %s FOR NO KEY UPDATE", (book_id,))
+
+            # Walk the queue from the head (idx_holds_queue) to the first eligible
+            # member, each probe seeking one index step past the last hold passed
+            # over. SKIP LOCKED passes over a hold that is being cancelled right
+            # now instead of waiting on it.
+            after = 0
+            while True:
+                cur.execute("""
+                    SELECT hold_id, member_id
+                    FROM holds
+                    WHERE book_id = %s AND status = 'Waiting' AND hold_id > %s
+                    ORDER BY hold_id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                """, (book_id, after))
+                hold = cur.fetchone()
+                if not hold:
+                    break
+                # The savepoint lets us drop the lock on a member we pass over, so a
+                # hand-off never holds one member while waiting for another.
+                cur.execute("SAVEPOINT candidate")
+                open_loans, this_book = _lock_member_loans(cur, hold['member_id'], book_id)
+                if open_loans < MAX_LOANS and not this_book:
+                    break
+                cur.execute("ROLLBACK TO SAVEPOINT candidate")
+                if this_book:
+                    cur.execute("UPDATE holds SET status = 'Cancelled' WHERE hold_id = %s", (hold['hold_id'],))
+                after = hold['hold_id']
+
+            result = {"book_id": book_id, "next_member_id": None, "next_loan_id": None}
+            if hold:
+                cur.execute("""
+                    INSERT INTO loans (book_id, member_id, due_date)
+                    VALUES (%s, %s, CURRENT_DATE + %s)
+                    RETURNING loan_id
+                """, (book_id, hold['member_id'], LOAN_DAYS))
+                next_loan_id = cur.fetchone()['loan_id']
+                cur.execute("""
+                    UPDATE holds SET status = 'Fulfilled', loan_id = %s
+                    WHERE hold_id = %s
+                """, (next_loan_id, hold['hold_id']))
+                result["next_member_id"] = hold['member_id']
+                result["next_loan_id"] = next_loan_id
+            else:
+                cur.execute("""
+                    UPDATE books SET copies_available = copies_available + 1
+                    WHERE book_id = %s
+                """, (book_id,))
+            cur.close()
+        return result
+
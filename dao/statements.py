@@ -0,0 +1,70 @@
+# dao/statements.py
+# Registry of hot DAO queries run as server-side prepared statements.
+#
+# A DAO registers its query once at import time with $1..$n placeholders; the
+# first execute() on each pooled connection sends PREPARE, every later call
+# sends only EXECUTE, so PostgreSQL skips parsing and (once it settles on a
+# generic plan) planning.
+import re
+import threading
+import time
+
+class StatementRegistry:
+    def __init__(self):
+        self._statements = {}    # name -> (param types, sql)
+        self._stats = {}         # name -> counters
+        self._lock = threading.Lock()
+
+    def register(self, name, param_types, sql):
+        """param_types: PostgreSQL types of $1..$n, e.g. ("text", "int")."""
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", name):
+            raise ValueError(f"bad statement name: {name!r}")
+        self._statements[name] = (tuple(param_types), sql)
+        self._stats[name] = {"prepares": 0, "executions": 0, "total_seconds": 0.0}
+
+    def execute(self, cur, name, params=()):
+        """Runs a registered statement on cur (a cursor from config.database.pooled_connection)."""
+        types, sql = self._statements[name]
+        conn = cur.connection
+        start = time.perf_counter()
+        if name not in conn.prepared:
+            type_list = f" ({', '.join(types)})" if types else ""
+            cur.execute(f"PREPARE {name}{type_list} AS {sql}")
+            conn.prepared.add(name)
+            with self._lock:
+                self._stats[name]["prepares"] += 1
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", tuple(params))
+        else:
+            cur.execute(f"EXECUTE {name}")
+        with self._lock:
+            self._stats[name]["executions"] += 1
+            self._stats[name]["total_seconds"] += time.perf_counter() - start
+
+    def execute_adhoc(self, cur, name, params=()):
+        """Runs the same query as plain SQL text; used to benchmark against execute()."""
+        _, sql = self._statements[name]
+        adhoc = re.sub(r"\$(\d+)", lambda m: f"%(p{m.group(1)})s", sql.replace("%", "%%"))
+        cur.execute(adhoc, {f"p{i}": v for i, v in enumerate(params, 1)})
+
+    def stats(self):
+        """Client-side counters per statement: prepares, executions, reuse ratio, mean ms."""
+        with self._lock:
+            out = {}
+            for name, s in self._stats.items():
+                n = s["executions"]
+                out[name] = {
+                    "prepares": s["prepares"],
+                    "executions": n,
+                    "reuse_ratio": (n - s["prepares"]) / n if n else 0.0,
+                    "mean_ms": s["total_seconds"] * 1000 / n if n else 0.0,
+                }
+            return out
+
+    @staticmethod
+    def server_plan_stats(cur):
+        """This connection's plan cache as PostgreSQL sees it (generic/custom plan counts need PG 14+)."""
+        cur.execute("SELECT * FROM pg_prepared_statements ORDER BY name")
+        return cur.fetchall()
+
+statements = StatementRegistry()
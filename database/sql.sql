@@ -42,16 +42,38 @@ CREATE TABLE loans (
     member_id    INT REFERENCES members(member_id) ON DELETE CASCADE,
     loan_date    DATE DEFAULT CURRENT_DATE,
     due_date     DATE NOT NULL DEFAULT (CURRENT_DATE + INTERVAL '7 days'),
-    return_date  DATE,
-    CONSTRAINT one_copy_at_a_time UNIQUE (book_id, return_date)
+    return_date  DATE
 );
 
+-- A member holds at most one open loan of a title. Returned loans are not
+-- constrained, so any number of copies can come back on the same day.
+CREATE UNIQUE INDEX idx_loans_one_open_per_member ON loans (book_id, member_id)
+    WHERE return_date IS NULL;
+
+-- 5b. Holds (FIFO reservation queue per book)
+CREATE TABLE holds (
+    hold_id      BIGSERIAL PRIMARY KEY,          -- also the queue order
+    book_id      INT NOT NULL REFERENCES books(book_id) ON DELETE CASCADE,
+    member_id    INT NOT NULL REFERENCES members(member_id) ON DELETE CASCADE,
+    placed_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status       VARCHAR(10) NOT NULL DEFAULT 'Waiting'
+                 CHECK (status IN ('Waiting', 'Fulfilled', 'Cancelled')),
+    loan_id      INT REFERENCES loans(loan_id) ON DELETE SET NULL
+);
+
+-- Head of each book's queue is the first entry of this index, so allocation is a single index probe.
+CREATE INDEX idx_holds_queue ON holds (book_id, hold_id) WHERE status = 'Waiting';
+-- A member can only wait once per book.
+CREATE UNIQUE INDEX idx_holds_one_per_member ON holds (book_id, member_id) WHERE status = 'Waiting';
+CREATE INDEX idx_holds_member ON holds (member_id) WHERE status = 'Waiting';
+
 -- 6. Book Clubs
 CREATE TABLE book_clubs (
     club_id      SERIAL PRIMARY KEY,
     name         VARCHAR(100) NOT NULL,
     description  TEXT,
-    created_date DATE DEFAULT CURRENT_DATE
+    created_date DATE DEFAULT CURRENT_DATE,
+    member_count INT NOT NULL DEFAULT 0 CHECK (member_count >= 0)  -- maintained by club_membership triggers
 );
 
 -- 7. Club Membership (Many-to-Many)
@@ -62,6 +84,99 @@ CREATE TABLE club_membership (
     PRIMARY KEY (club_id, member_id)
 );
 
+CREATE INDEX idx_club_membership_member ON club_membership (member_id);
+
+-- Keep book_clubs.member_count in step with club_membership.
+-- Statement-level so a bulk enrollment costs one UPDATE per club, not one per row.
+CREATE FUNCTION club_membership_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE book_clubs c SET member_count = c.member_count + d.n
+        FROM (SELECT club_id, COUNT(*) AS n FROM new_rows GROUP BY club_id) d
+        WHERE c.club_id = d.club_id;
+    ELSE
+        UPDATE book_clubs c SET member_count = c.member_count - d.n
+        FROM (SELECT club_id, COUNT(*) AS n FROM old_rows GROUP BY club_id) d
+        WHERE c.club_id = d.club_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER club_membership_count_ins
+    AFTER INSERT ON club_membership
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION club_membership_count();
+
+CREATE TRIGGER club_membership_count_del
+    AFTER DELETE ON club_membership
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION club_membership_count();
+
+-- 8. Catalog change log (incremental sync for member workstation replicas)
+-- Every change to books/authors is logged with its transaction id. A replica remembers
+-- the oldest transaction still running when it last synced (txid_snapshot_xmin) and next
+-- time re-reads only rows changed by transactions from that point on.
+CREATE TABLE catalog_changes (
+    change_id   BIGSERIAL PRIMARY KEY,
+    table_name  VARCHAR(20) NOT NULL,
+    row_id      INT NOT NULL,
+    txid        BIGINT NOT NULL DEFAULT txid_current(),
+    changed_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_catalog_changes_txid ON catalog_changes (txid);
+
+CREATE FUNCTION log_catalog_change() RETURNS trigger AS $$
+DECLARE
+    r RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN r := OLD; ELSE r := NEW; END IF;
+    IF TG_TABLE_NAME = 'books' THEN
+        INSERT INTO catalog_changes (table_name, row_id) VALUES ('books', r.book_id);
+    ELSE
+        INSERT INTO catalog_changes (table_name, row_id) VALUES ('authors', r.author_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER books_catalog_change
+    AFTER INSERT OR UPDATE OR DELETE ON books
+    FOR EACH ROW EXECUTE FUNCTION log_catalog_change();
+
+CREATE TRIGGER authors_catalog_change
+    AFTER INSERT OR UPDATE OR DELETE ON authors
+    FOR EACH ROW EXECUTE FUNCTION log_catalog_change();
+
+-- The log only has to reach back as far as the stalest replica. prune_catalog_changes()
+-- drops entries older than the retention window (the librarian dashboard runs it at
+-- login; cron works too) and raises the horizon past every txid it removed. A replica
+-- whose watermark is below the horizon may have missed pruned changes and resyncs in full.
+CREATE TABLE catalog_sync_horizon (
+    id    BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),   -- single row
+    txid  BIGINT NOT NULL
+);
+INSERT INTO catalog_sync_horizon (txid) VALUES (0);
+
+CREATE FUNCTION prune_catalog_changes(retain INTERVAL DEFAULT '7 days') RETURNS BIGINT AS $$
+DECLARE
+    pruned BIGINT;
+    newest BIGINT;
+BEGIN
+    WITH gone AS (
+        DELETE FROM catalog_changes
+        WHERE changed_at < CURRENT_TIMESTAMP - retain
+        RETURNING txid
+    )
+    SELECT COUNT(*), MAX(txid) INTO pruned, newest FROM gone;
+    IF newest IS NOT NULL THEN
+        UPDATE catalog_sync_horizon SET txid = GREATEST(txid, newest + 1);
+    END IF;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
+
 INSERT INTO authors (name, biography) VALUES
 ('George Orwell', 'Author of 1984'),
 ('J.K. Rowling', 'Harry Potter series'),
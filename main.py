@@ -1,6 +1,13 @@
 # main.py
+import os
 import sys
 import traceback
+
+# Headless API server mode: no Qt needed, so branch off before importing it.
+if __name__ == "__main__" and "--serve" in sys.argv:
+    from api.server import main as serve_main
+    sys.exit(serve_main(sys.argv[1:]))
+
 from ui.dashboard_librarian import LibrarianDashboard
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel,
@@ -119,6 +126,13 @@ class LoginWindow(QWidget):
 if __name__ == "__main__":
     print("DEBUG: Starting app...")
     app = QApplication(sys.argv)
+
+    # Opt-in stall watchdog: logs GUI freezes and the dashboard method / DAO call behind them
+    if "--watchdog" in sys.argv or os.environ.get("SMART_LIBRARY_WATCHDOG"):
+        from ui.watchdog import StallWatchdog
+        watchdog = StallWatchdog(app)
+        watchdog.start()
+
     win = LoginWindow()
     win.show()
     print("DEBUG: Login window shown. Run 'python main.py' and check console for logs.")
@@ -0,0 +1,133 @@
+# tests/test_table_sync.py
+# KeyedTableSync (ui/table_sync.py) against a real, offscreen QTableWidget.
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+from ui.table_sync import KeyedTableSync, set_cell
+
+COLUMNS = ["book_id", "title", "author_name", "genre", "published_year", "copies_available"]
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def _books(n, start=0):
+    return [{"book_id": i, "title": f"Book {i}", "author_name": f"Author {i % 97}", "genre": "Fiction",
+             "published_year": 1900 + i % 120, "copies_available": i % 4} for i in range(start, start + n)]
+
+def _catalog_table(rendered):
+    """Catalog-shaped table with a button per row; rendered collects each render_row call."""
+    table = QtWidgets.QTableWidget()
+    table.setColumnCount(len(COLUMNS) + 1)
+
+    def render(row, book):
+        rendered.append(book["book_id"])
+        for col, key in enumerate(COLUMNS):
+            set_cell(table, row, col, str(book[key]))
+        btn = table.cellWidget(row, len(COLUMNS))
+        if btn is None:
+            btn = QtWidgets.QPushButton()
+            table.setCellWidget(row, len(COLUMNS), btn)
+        btn.setText("Borrow" if book["copies_available"] else "Place Hold")
+
+    return table, KeyedTableSync(table, "book_id", render)
+
+def _live_buttons(table):
+    # Widgets of removed rows are deleted later; flush so only live ones are counted.
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return len(table.findChildren(QtWidgets.QPushButton))
+
+def test_rows_and_buttons_stay_constant_over_10k_cycles(app):
+    rng = random.Random(7)
+    rows = 20
+    table, sync = _catalog_table([])
+    books = _books(rows)
+    sync.apply(books)
+    assert table.rowCount() == rows
+    assert _live_buttons(table) == rows
+
+    next_id = rows
+    for cycle in range(10000):
+        books = [dict(b) for b in books]
+        for b in rng.sample(books, 3):
+            b["copies_available"] = max(0, b["copies_available"] + rng.choice((-1, 1)))
+        books.pop(rng.randrange(len(books)))
+        books.insert(rng.randrange(len(books) + 1), _books(1, next_id)[0])
+        next_id += 1
+        sync.apply(books)
+        if cycle % 500 == 0:
+            assert table.rowCount() == rows
+            assert _live_buttons(table) == rows
+
+    assert table.rowCount() == rows
+    assert _live_buttons(table) == rows
+    assert [int(table.item(r, 0).text()) for r in range(rows)] == [b["book_id"] for b in books]
+
+@pytest.mark.parametrize("changed", [0, 1, 10])
+def test_apply_rerenders_only_changed_rows(app, changed):
+    rendered = []
+    table, sync = _catalog_table(rendered)
+    books = _books(500)
+    sync.apply(books)
+    rendered.clear()
+
+    updated = [dict(b) for b in books]
+    for b in updated[:changed]:
+        b["title"] += " (2nd ed.)"
+    counts = sync.apply(updated)
+
+    assert counts == {"inserted": 0, "updated": changed, "removed": 0, "moved": 0}
+    assert rendered == [b["book_id"] for b in books[:changed]]
+    assert table.item(0, 1).text() == updated[0]["title"]
+
+def _shown_ids(table):
+    return [int(table.item(r, 0).text()) for r in range(table.rowCount())]
+
+@pytest.mark.parametrize("source, target", [(0, 999), (999, 0), (10, 500)])
+def test_moving_one_row_rerenders_only_that_row(app, source, target):
+    rendered = []
+    table, sync = _catalog_table(rendered)
+    books = _books(1000)
+    sync.apply(books)
+    rendered.clear()
+
+    # e.g. a renamed title changing its place in the title-sorted catalog
+    reordered = list(books)
+    reordered.insert(target, reordered.pop(source))
+    counts = sync.apply(reordered)
+
+    assert counts == {"inserted": 0, "updated": 0, "removed": 0, "moved": 1}
+    assert rendered == [books[source]["book_id"]]
+    assert _shown_ids(table) == [b["book_id"] for b in reordered]
+    assert _live_buttons(table) == 1000
+
+def test_random_reorders_match_records(app):
+    rng = random.Random(11)
+    table, sync = _catalog_table([])
+    books = _books(60)
+    sync.apply(books)
+    next_id = 60
+    for _ in range(300):
+        books = [dict(b) for b in books]
+        rng.shuffle(books)
+        for b in rng.sample(books, 2):
+            b["title"] += "!"
+        del books[rng.randrange(len(books))]
+        books.append(_books(1, next_id)[0])
+        next_id += 1
+        counts = sync.apply(books)
+        assert counts["inserted"] == 1 and counts["removed"] == 1
+        assert _shown_ids(table) == [b["book_id"] for b in books]
+        assert [table.item(r, 1).text() for r in range(len(books))] == [b["title"] for b in books]
+
+def test_duplicate_keys_are_rejected(app):
+    table, sync = _catalog_table([])
+    books = _books(3)
+    with pytest.raises(ValueError, match="duplicate"):
+        sync.apply(books + [dict(books[0])])
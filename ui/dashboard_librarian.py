@@ -4,10 +4,11 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QTabWidget, QTableWidget, QTableWidgetItem, QPushButton,
     QLineEdit, QMessageBox, QGroupBox, QFormLayout,
-    QSpinBox, QHeaderView, QAbstractItemView
+    QSpinBox, QHeaderView, QAbstractItemView, QInputDialog
 )
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QBrush, QFont, QIcon   # QBrush lives HERE!
+from ui.table_sync import KeyedTableSync, set_cell
 
 
 try:
@@ -58,6 +59,8 @@ except ImportError:
         def get_active_loans(): return []
         @staticmethod
         def get_overdue_loans(): return []
+        @staticmethod
+        def return_loan(lid): return {"book_id": None, "next_member_id": None, "next_loan_id": None}
 
 try:
     from dao.club_dao import ClubDAO
@@ -68,6 +71,10 @@ except ImportError:
             {"club_id":1, "name":"Sci-Fi Lovers", "member_count":12},
             {"club_id":2, "name":"Mystery Readers", "member_count":8}
         ]
+        @staticmethod
+        def delete_club(cid): return True
+        @staticmethod
+        def bulk_join(cid, member_ids): return len(set(member_ids))
 
 # ────────────────────── LIBRARIAN DASHBOARD ──────────────────────
 class LibrarianDashboard(QMainWindow):
@@ -89,6 +96,13 @@ class LibrarianDashboard(QMainWindow):
 
         self.setCentralWidget(self.tabs)
 
+        # Keep the catalog change log bounded; stale member replicas resync in full.
+        try:
+            from dao.catalog_replica import prune_change_log
+            prune_change_log()
+        except Exception as e:
+            print(f"DEBUG: catalog change log not pruned: {e}")
+
         # Initial refresh
         self.refresh_all()
 
@@ -97,9 +111,15 @@ class LibrarianDashboard(QMainWindow):
         self.refresh_catalog()
 
     def refresh_dashboard(self):
-        new_tab = self.dashboard_tab()
-        self.tabs.removeTab(0)
-        self.tabs.insertTab(0, new_tab, "Dashboard")
+        # Update the stat boxes in place rather than rebuilding (and leaking) the whole tab
+        counts = {
+            "Total Books": len(BookDAO.get_all_books()),
+            "Active Loans": len(LoanDAO.get_active_loans()),
+            "Total Members": len(MemberDAO.get_all_members()),
+            "Book Clubs": len(ClubDAO.get_all_clubs()),
+        }
+        for text, value in counts.items():
+            self.stat_labels[text].setText(str(value))
 
     def refresh_catalog(self):
         if hasattr(self, 'catalog_table'):
@@ -114,21 +134,23 @@ class LibrarianDashboard(QMainWindow):
 
         grid = QHBoxLayout()
         stats = [
-            ("Total Books", len(BookDAO.get_all_books()), "#3b82f6"),
-            ("Active Loans", len(LoanDAO.get_active_loans()), "#10b981"),
-            ("Total Members", len(MemberDAO.get_all_members()), "#8b5cf6"),
-            ("Book Clubs", len(ClubDAO.get_all_clubs()), "#f59e0b")
+            ("Total Books", "#3b82f6"),
+            ("Active Loans", "#10b981"),
+            ("Total Members", "#8b5cf6"),
+            ("Book Clubs", "#f59e0b")
         ]
-        for text, value, color in stats:
+        self.stat_labels = {}
+        for text, color in stats:
             box = QGroupBox(text)
             box.setStyleSheet(f"background:white; border:3px solid {color}; border-radius:12px; padding:15px;")
             v = QVBoxLayout()
-            lbl = QLabel(str(value))
+            lbl = QLabel("-")
             lbl.setStyleSheet("font-size:42px; font-weight:bold; color:#1e293b;")
             lbl.setAlignment(Qt.AlignCenter)
             v.addWidget(lbl)
             box.setLayout(v)
             grid.addWidget(box)
+            self.stat_labels[text] = lbl
         lay.addLayout(grid)
 
         lay.addWidget(QLabel("<h3>Most Popular Books (Demo)</h3>"))
@@ -160,6 +182,7 @@ class LibrarianDashboard(QMainWindow):
         self.catalog_table.setColumnCount(7)
         self.catalog_table.setHorizontalHeaderLabels(["ID","Title","Author","ISBN","Genre","Year","Available"])
         self.catalog_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.catalog_rows = KeyedTableSync(self.catalog_table, "book_id", self.render_catalog_row)
         lay.addWidget(self.catalog_table)
 
         self.load_catalog("")
@@ -172,15 +195,16 @@ class LibrarianDashboard(QMainWindow):
             query = query.lower()
             books = [b for b in books if query in b["title"].lower() or query in b["author_name"].lower()]
 
-        self.catalog_table.setRowCount(len(books))
-        for r, b in enumerate(books):
-            self.catalog_table.setItem(r,0,QTableWidgetItem(str(b["book_id"])))
-            self.catalog_table.setItem(r,1,QTableWidgetItem(b["title"]))
-            self.catalog_table.setItem(r,2,QTableWidgetItem(b["author_name"]))
-            self.catalog_table.setItem(r,3,QTableWidgetItem(b.get("isbn","")))
-            self.catalog_table.setItem(r,4,QTableWidgetItem(b.get("genre","")))
-            self.catalog_table.setItem(r,5,QTableWidgetItem(str(b.get("published_year",""))))
-            self.catalog_table.setItem(r,6,QTableWidgetItem(str(b["copies_available"])))
+        self.catalog_rows.apply(books)
+
+    def render_catalog_row(self, r, b):
+        set_cell(self.catalog_table,r,0,str(b["book_id"]))
+        set_cell(self.catalog_table,r,1,b["title"])
+        set_cell(self.catalog_table,r,2,b["author_name"])
+        set_cell(self.catalog_table,r,3,b.get("isbn",""))
+        set_cell(self.catalog_table,r,4,b.get("genre",""))
+        set_cell(self.catalog_table,r,5,str(b.get("published_year","")))
+        set_cell(self.catalog_table,r,6,str(b["copies_available"]))
 
     # 3. ADD BOOK
     def add_book_tab(self):
@@ -220,7 +244,7 @@ class LibrarianDashboard(QMainWindow):
 
         BookDAO.add_book(
             title=self.title_in.text().strip(),
-            author_id=self.author_in.text().strip() or "Unknown",
+            author_id=AuthorDAO.get_or_create(self.author_in.text().strip() or "Unknown"),
             isbn=self.isbn_in.text().strip() or None,
             genre=self.genre_in.text().strip(),
             published_year=self.year_in.value(),
@@ -254,6 +278,7 @@ class LibrarianDashboard(QMainWindow):
         self.loans_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.loans_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.loans_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.loan_rows = KeyedTableSync(self.loans_table, "loan_id", self.render_loan_row)
         layout.addWidget(self.loans_table)
 
         # Refresh Button
@@ -298,40 +323,39 @@ class LibrarianDashboard(QMainWindow):
                 }
             ]
 
-        self.loans_table.setRowCount(0)
-        today = QDate.currentDate()
-
-        for loan in loans:
-            row = self.loans_table.rowCount()
-            self.loans_table.insertRow(row)
-
-            # Basic info
-            self.loans_table.setItem(row, 0, QTableWidgetItem(str(loan.get("loan_id", ""))))
-            self.loans_table.setItem(row, 1, QTableWidgetItem(loan.get("title", "Unknown Book")))
-            self.loans_table.setItem(row, 2, QTableWidgetItem(loan.get("member_name", "Unknown Member")))
-            self.loans_table.setItem(row, 3, QTableWidgetItem(str(loan.get("loan_date", ""))))
-
-            # Due date with color
-            due_str = str(loan.get("due_date", ""))
-            due_item = QTableWidgetItem(due_str)
-            try:
-                due_date = QDate.fromString(due_str.split()[0], "yyyy-MM-dd")
-                if due_date < today:
-                    due_item.setForeground(QBrush(Qt.red))
-                    due_item.setText(due_str + " (OVERDUE!)")
-
-                days_left = today.daysTo(due_date)
-                status = "OVERDUE" if days_left < 0 else "On Time"
-                status_item = QTableWidgetItem(status)
-                status_item.setForeground(QBrush(Qt.red if days_left < 0 else Qt.darkGreen))
-                status_item.setTextAlignment(Qt.AlignCenter)
-                self.loans_table.setItem(row, 5, status_item)
-            except:
-                pass
-
-            self.loans_table.setItem(row, 4, due_item)
-
-            # Return Button
+        # The date is part of each record so overdue colouring updates when the day rolls over
+        today = QDate.currentDate().toString("yyyy-MM-dd")
+        self.loan_rows.apply([dict(loan, today=today) for loan in loans])
+
+    def render_loan_row(self, row, loan):
+        today = QDate.fromString(loan["today"], "yyyy-MM-dd")
+
+        # Basic info
+        set_cell(self.loans_table, row, 0, str(loan.get("loan_id", "")))
+        set_cell(self.loans_table, row, 1, loan.get("title", "Unknown Book"))
+        set_cell(self.loans_table, row, 2, loan.get("member_name", "Unknown Member"))
+        set_cell(self.loans_table, row, 3, str(loan.get("loan_date", "")))
+
+        # Due date with color
+        due_str = str(loan.get("due_date", ""))
+        due_item = set_cell(self.loans_table, row, 4, due_str)
+        try:
+            due_date = QDate.fromString(due_str.split()[0], "yyyy-MM-dd")
+            if due_date < today:
+                due_item.setForeground(QBrush(Qt.red))
+                due_item.setText(due_str + " (OVERDUE!)")
+            else:
+                due_item.setForeground(QBrush(Qt.black))
+
+            days_left = today.daysTo(due_date)
+            status = "OVERDUE" if days_left < 0 else "On Time"
+            set_cell(self.loans_table, row, 5, status,
+                     Qt.red if days_left < 0 else Qt.darkGreen, Qt.AlignCenter)
+        except:
+            pass
+
+        # Return Button (created once per row; the loan it returns never changes)
+        if self.loans_table.cellWidget(row, 6) is None:
             return_btn = QPushButton("Return Book")
             return_btn.setStyleSheet("""
                 QPushButton {
@@ -348,14 +372,24 @@ class LibrarianDashboard(QMainWindow):
         reply = QMessageBox.question(self, "Confirm Return",
                                     f"Mark Loan ID {loan_id} as returned?",
                                     QMessageBox.Yes | QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            try:
-                from dao.loan_dao import LoanDAO
-                LoanDAO.return_loan(loan_id)
-            except:
-                pass  # Demo mode
-            QMessageBox.information(self, "Success", f"Book returned! (Loan ID: {loan_id})")
-            self.load_loans()
+        if reply != QMessageBox.Yes:
+            return
+
+        try:
+            result = LoanDAO.return_loan(loan_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not return Loan ID {loan_id}:\n{e}")
+            return
+
+        if result is None:
+            QMessageBox.warning(self, "Not Returned", f"Loan ID {loan_id} is no longer active.")
+        else:
+            message = f"Book returned! (Loan ID: {loan_id})"
+            if result["next_member_id"]:
+                message += (f"\n\nThe copy was loaned to the next member on hold "
+                            f"(Member ID {result['next_member_id']}, Loan ID {result['next_loan_id']}).")
+            QMessageBox.information(self, "Success", message)
+        self.load_loans()
     # ==============================================================================
 
     # ===================== BOOK CLUBS MANAGEMENT — FULLY WORKING =====================
@@ -370,9 +404,9 @@ class LibrarianDashboard(QMainWindow):
 
         # Clubs Table
         self.clubs_table = QTableWidget()
-        self.clubs_table.setColumnCount(4)
+        self.clubs_table.setColumnCount(5)
         self.clubs_table.setHorizontalHeaderLabels([
-            "Club ID", "Club Name", "Description", "Members"
+            "Club ID", "Club Name", "Description", "Members", "Action"
         ])
         self.clubs_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.clubs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -390,9 +424,14 @@ class LibrarianDashboard(QMainWindow):
         add_btn.setStyleSheet("background:#10b981; color:white; padding:12px; font-weight:bold; border-radius:8px;")
         add_btn.clicked.connect(self.add_new_club)
 
+        enroll_btn = QPushButton("Enroll Members")
+        enroll_btn.setStyleSheet("background:#f59e0b; color:white; padding:12px; font-weight:bold; border-radius:8px;")
+        enroll_btn.clicked.connect(self.enroll_members)
+
         btn_layout.addStretch()
         btn_layout.addWidget(refresh_btn)
         btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(enroll_btn)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
@@ -435,7 +474,7 @@ class LibrarianDashboard(QMainWindow):
             delete_btn.setStyleSheet("background:#ef4444; color:white; font-weight:bold; border-radius:6px;")
             club_id = club.get("club_id")  # capture current value
             delete_btn.clicked.connect(lambda checked, cid=club_id: self.delete_club(cid))
-            self.clubs_table.setCellWidget(row, 4, delete_btn)  # add column if needed
+            self.clubs_table.setCellWidget(row, 4, delete_btn)
 
         # Auto-resize last column
         self.clubs_table.resizeColumnsToContents()
@@ -461,4 +500,44 @@ class LibrarianDashboard(QMainWindow):
             QMessageBox.information(self, "Demo Mode", f"Club '{name}' created (demo only)!")
 
         # Always refresh after adding
+        self.load_clubs()
+
+    def delete_club(self, club_id):
+        reply = QMessageBox.question(self, "Confirm Delete",
+                                    f"Delete Club ID {club_id} and all its memberships?",
+                                    QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        try:
+            if not ClubDAO.delete_club(club_id):
+                QMessageBox.warning(self, "Failed", f"Club ID {club_id} no longer exists.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not delete Club ID {club_id}:\n{e}")
+
+        self.load_clubs()
+
+    def enroll_members(self):
+        row = self.clubs_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "No Club Selected", "Select a club to enroll members into.")
+            return
+        club_id = int(self.clubs_table.item(row, 0).text())
+
+        text, ok = QInputDialog.getText(self, "Enroll Members",
+                                        "Member IDs (comma separated):")
+        if not ok or not text.strip():
+            return
+        try:
+            member_ids = [int(part) for part in text.replace(" ", "").split(",") if part]
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Member IDs must be numbers.")
+            return
+
+        try:
+            added = ClubDAO.bulk_join(club_id, member_ids)
+            QMessageBox.information(self, "Success", f"{added} member(s) enrolled in Club ID {club_id}.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not enroll members in Club ID {club_id}:\n{e}")
+
         self.load_clubs()
\ No newline at end of file
@@ -1,26 +1,56 @@
 #memberdashboard.py
 from PyQt5.QtWidgets import *
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QDate, QTimer
+from ui.table_sync import KeyedTableSync, set_cell
+from utils.constants import HOLD_POSITION_CAP
 
-# Import DAOs safely
+# Import DAOs safely, one at a time so a missing module only stubs its own DAO
 try:
     from dao.book_dao import BookDAO
-    from dao.loan_dao import LoanDAO
-    from dao.club_dao import ClubDAO
 except ImportError:
     # Fallback if DAOs not ready
     class BookDAO:
         @staticmethod
         def get_available_books(search=""):
             return [{"book_id":1,"title":"Sample Book","author_name":"Author","genre":"Fiction","published_year":2023,"copies_available":1}]
+
+try:
+    from dao.loan_dao import LoanDAO
+except ImportError:
     class LoanDAO:
         @staticmethod
         def get_member_loans(id): return []
         @staticmethod
         def issue_loan(bid, mid): return True
+
+try:
+    from dao.club_dao import ClubDAO
+except ImportError:
     class ClubDAO:
         @staticmethod
-        def get_all_clubs(): return [{"name":"Demo Club","description":"Fun!","member_count":5}]
+        def get_all_clubs(): return [{"club_id":1,"name":"Demo Club","description":"Fun!","member_count":5}]
+        @staticmethod
+        def get_member_club_ids(mid): return set()
+        @staticmethod
+        def join_club(cid, mid): return True
+        @staticmethod
+        def leave_club(cid, mid): return True
+
+try:
+    from dao.hold_dao import HoldDAO
+except ImportError:
+    class HoldDAO:
+        @staticmethod
+        def place_hold(bid, mid): return 1
+        @staticmethod
+        def cancel_hold(hid, mid): return True
+        @staticmethod
+        def get_member_holds(mid): return []
+
+try:
+    from dao.catalog_replica import CatalogReplica
+except ImportError:
+    CatalogReplica = None
 
 class MemberDashboard(QMainWindow):
     def __init__(self, user):
@@ -43,6 +73,19 @@ class MemberDashboard(QMainWindow):
             self.member_id = getattr(user, "id", 1)
         # =================================================================
 
+        # Local catalog replica: searches stay on this machine, a background thread pulls changes
+        self.catalog = None
+        if CatalogReplica:
+            try:
+                self.catalog = CatalogReplica()
+                if self.catalog.is_empty():
+                    self.catalog.sync()  # first run needs a full copy before the first search
+                self.catalog.start_background_sync()
+            except Exception as e:
+                print(f"DEBUG: Catalog replica unavailable, searching the server - {e}")
+                self.catalog = None
+        self.catalog_generation = self.catalog.generation if self.catalog else 0
+
         self.setWindowTitle(f"SmartLibrary - Member: {self.username}")
         self.setGeometry(100, 80, 1150, 720)
         self.setStyleSheet("background:#f8fafc; font-family: Segoe UI;")
@@ -58,9 +101,15 @@ class MemberDashboard(QMainWindow):
         self.setCentralWidget(tabs)
         self.refresh_all()
 
+        if self.catalog:
+            self.sync_timer = QTimer(self)
+            self.sync_timer.timeout.connect(self.check_catalog_sync)
+            self.sync_timer.start(1000)
+
 
     def refresh_all(self):
         self.refresh_my_loans()
+        self.refresh_my_holds()
         self.refresh_catalog()
 
     def home_tab(self):
@@ -94,6 +143,10 @@ class MemberDashboard(QMainWindow):
         search_bar.addWidget(self.search_box)
         l.addLayout(search_bar)
 
+        self.sync_label = QLabel("Catalog: live from server" if not self.catalog else "")
+        self.sync_label.setStyleSheet("color:#64748b;")
+        l.addWidget(self.sync_label)
+
         # Table
         self.book_table = QTableWidget()
         self.book_table.setColumnCount(7)
@@ -103,6 +156,7 @@ class MemberDashboard(QMainWindow):
         self.book_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.book_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.book_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.book_rows = KeyedTableSync(self.book_table, "book_id", self.render_book_row)
         l.addWidget(self.book_table)
 
         self.refresh_catalog()
@@ -111,22 +165,48 @@ class MemberDashboard(QMainWindow):
 
     def refresh_catalog(self):
         query = self.search_box.text().lower()
-        books = BookDAO.get_available_books(search=query)
+        if self.catalog:
+            books = self.catalog.search(query)
+        else:
+            books = BookDAO.get_available_books(search=query)
 
-        self.book_table.setRowCount(len(books))
-        for i, book in enumerate(books):
-            for col, key in enumerate(["book_id", "title", "author_name", "genre", "published_year", "copies_available"]):
-                self.book_table.setItem(i, col, QTableWidgetItem(str(book.get(key, ""))))
+        self.book_rows.apply(books)
 
-            # Borrow button
-            btn = QPushButton("Borrow")
-            btn.setStyleSheet("background:#3b82f6; color:white;")
-            if book["copies_available"] == 0:
-                btn.setEnabled(False)
-                btn.setText("Unavailable")
-            else:
-                btn.clicked.connect(lambda _, bid=book["book_id"], title=book["title"]: self.borrow_book(bid, title))
+    def render_book_row(self, i, book):
+        for col, key in enumerate(["book_id", "title", "author_name", "genre", "published_year", "copies_available"]):
+            set_cell(self.book_table, i, col, str(book.get(key, "")))
+
+        # Borrow button, or join the hold queue when no copy is on the shelf.
+        # The button lives as long as its row; updates only restyle it.
+        btn = self.book_table.cellWidget(i, 6)
+        if btn is None:
+            btn = QPushButton()
+            btn.clicked.connect(lambda _, bid=book["book_id"]: self.book_action(bid))
             self.book_table.setCellWidget(i, 6, btn)
+        if book["copies_available"] == 0:
+            btn.setText("Place Hold")
+            btn.setStyleSheet("background:#f59e0b; color:white;")
+        else:
+            btn.setText("Borrow")
+            btn.setStyleSheet("background:#3b82f6; color:white;")
+
+    def book_action(self, book_id):
+        book = self.book_rows.record(book_id)
+        if book["copies_available"] == 0:
+            self.place_hold(book_id, book["title"])
+        else:
+            self.borrow_book(book_id, book["title"])
+
+    def check_catalog_sync(self):
+        if self.catalog.generation != self.catalog_generation:
+            self.catalog_generation = self.catalog.generation
+            self.refresh_catalog()
+
+        last = self.catalog.last_sync
+        if self.catalog.last_error:
+            self.sync_label.setText("Catalog: offline, showing local copy")
+        elif last:
+            self.sync_label.setText(f"Catalog synced {last['at']} ({last['rows']} changed rows, ~{last['est_bytes']} bytes est.)")
 
     def borrow_book(self, book_id, title):
         if len(LoanDAO.get_member_loans(self.member_id)) >= 3:
@@ -136,10 +216,28 @@ class MemberDashboard(QMainWindow):
         success = LoanDAO.issue_loan(book_id, self.member_id)
         if success:
             QMessageBox.information(self, "Success", f"You borrowed:\n<b>{title}</b>\nDue in 7 days!")
+            if self.catalog:
+                self.catalog.request_sync()
             self.refresh_all()
         else:
             QMessageBox.critical(self, "Error", "Could not borrow this book.")
 
+    def place_hold(self, book_id, title):
+        hold_id = HoldDAO.place_hold(book_id, self.member_id)
+        if hold_id:
+            QMessageBox.information(self, "On Hold",
+                                    f"You are in the queue for:\n<b>{title}</b>\n"
+                                    "It will be loaned to you automatically when a copy is returned.")
+        else:
+            QMessageBox.warning(self, "Hold Not Placed",
+                                "You already have this book or are waiting for it, "
+                                "or a copy is now available to borrow.")
+        self.refresh_all()
+
+    def cancel_hold(self, hold_id):
+        HoldDAO.cancel_hold(hold_id, self.member_id)
+        self.refresh_my_holds()
+
     # My Loans Tab
     def my_loans_tab(self):
         w = QWidget()
@@ -150,15 +248,25 @@ class MemberDashboard(QMainWindow):
         self.loans_table.setColumnCount(5)
         self.loans_table.setHorizontalHeaderLabels(["Book", "Loan Date", "Due Date", "Days Left", "Status"])
         self.loans_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.loan_rows = KeyedTableSync(self.loans_table, "loan_id", self.render_loan_row)
         l.addWidget(self.loans_table)
 
+        l.addWidget(QLabel("<h2>My Holds</h2>"))
+        self.holds_table = QTableWidget()
+        self.holds_table.setColumnCount(4)
+        self.holds_table.setHorizontalHeaderLabels(["Book", "Placed", "Queue Position", "Action"])
+        self.holds_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.holds_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.hold_rows = KeyedTableSync(self.holds_table, "hold_id", self.render_hold_row)
+        l.addWidget(self.holds_table)
+
         self.refresh_my_loans()
+        self.refresh_my_holds()
         w.setLayout(l)
         return w
 
     def refresh_my_loans(self):
         loans = LoanDAO.get_member_loans(self.member_id)
-        self.loans_table.setRowCount(len(loans))
 
         total_loans = len(loans)
 
@@ -170,19 +278,36 @@ class MemberDashboard(QMainWindow):
                 if label:
                     label.setText(f"You have <b>{total_loans}/3</b> books borrowed")
 
+        # days_left is part of the record so rows also re-render when the date rolls over
         today = QDate.currentDate()
-        for i, loan in enumerate(loans):
-            self.loans_table.setItem(i, 0, QTableWidgetItem(loan["title"]))
-            self.loans_table.setItem(i, 1, QTableWidgetItem(str(loan["loan_date"])))
-            self.loans_table.setItem(i, 2, QTableWidgetItem(str(loan["due_date"])))
+        self.loan_rows.apply([dict(loan, days_left=today.daysTo(QDate(loan["due_date"]))) for loan in loans])
+
+    def render_loan_row(self, i, loan):
+        set_cell(self.loans_table, i, 0, loan["title"])
+        set_cell(self.loans_table, i, 1, str(loan["loan_date"]))
+        set_cell(self.loans_table, i, 2, str(loan["due_date"]))
+
+        days_left = loan["days_left"]
+        set_cell(self.loans_table, i, 3, str(days_left))
 
-            days_left = (loan["due_date"] - today).days()
-            self.loans_table.setItem(i, 3, QTableWidgetItem(str(days_left)))
+        status = "On Time" if days_left >= 0 else "OVERDUE!"
+        set_cell(self.loans_table, i, 4, status, Qt.red if days_left < 0 else Qt.darkGreen)
 
-            status = "On Time" if days_left >= 0 else "OVERDUE!"
-            item = QTableWidgetItem(status)
-            item.setForeground(Qt.red if days_left < 0 else Qt.darkGreen)
-            self.loans_table.setItem(i, 4, item)
+    def refresh_my_holds(self):
+        self.hold_rows.apply(HoldDAO.get_member_holds(self.member_id))
+
+    def render_hold_row(self, i, hold):
+        set_cell(self.holds_table, i, 0, hold["title"])
+        set_cell(self.holds_table, i, 1, str(hold["placed_at"])[:16])
+        position = hold["position"]
+        set_cell(self.holds_table, i, 2,
+                 f"#{position}" if position <= HOLD_POSITION_CAP else f"#{HOLD_POSITION_CAP + 1}+")
+
+        if self.holds_table.cellWidget(i, 3) is None:
+            btn = QPushButton("Cancel Hold")
+            btn.setStyleSheet("background:#ef4444; color:white;")
+            btn.clicked.connect(lambda _, hid=hold["hold_id"]: self.cancel_hold(hid))
+            self.holds_table.setCellWidget(i, 3, btn)
 
     # Book Clubs Tab
     def clubs_tab(self):
@@ -190,21 +315,67 @@ class MemberDashboard(QMainWindow):
         l = QVBoxLayout()
         l.addWidget(QLabel("<h2>Available Book Clubs</h2>"))
 
-        clubs = ClubDAO.get_all_clubs()
-        table = QTableWidget(len(clubs), 3)
-        table.setHorizontalHeaderLabels(["Club Name", "Description", "Members"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-        for i, club in enumerate(clubs):
-            table.setItem(i, 0, QTableWidgetItem(club["name"]))
-            table.setItem(i, 1, QTableWidgetItem(club["description"] or "No description"))
-            table.setItem(i, 2, QTableWidgetItem(str(club["member_count"])))
+        self.clubs_table = QTableWidget()
+        self.clubs_table.setColumnCount(4)
+        self.clubs_table.setHorizontalHeaderLabels(["Club Name", "Description", "Members", "Joined"])
+        self.clubs_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.clubs_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.clubs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
 
+        btn_bar = QHBoxLayout()
         join_btn = QPushButton("Join Selected Club")
         join_btn.setStyleSheet("background:#10b981; color:white; padding:12px; font-weight:bold;")
-        join_btn.clicked.connect(lambda: QMessageBox.information(self, "Joined!", "You are now a member of this group!"))
-
-        l.addWidget(table)
-        l.addWidget(join_btn)
+        join_btn.clicked.connect(self.join_selected_club)
+        leave_btn = QPushButton("Leave Selected Club")
+        leave_btn.setStyleSheet("background:#ef4444; color:white; padding:12px; font-weight:bold;")
+        leave_btn.clicked.connect(self.leave_selected_club)
+        btn_bar.addWidget(join_btn)
+        btn_bar.addWidget(leave_btn)
+
+        l.addWidget(self.clubs_table)
+        l.addLayout(btn_bar)
         w.setLayout(l)
-        return w
\ No newline at end of file
+
+        self.refresh_clubs()
+        return w
+
+    def refresh_clubs(self):
+        clubs = ClubDAO.get_all_clubs()
+        mine = ClubDAO.get_member_club_ids(self.member_id)
+
+        self.clubs_table.setRowCount(len(clubs))
+        for i, club in enumerate(clubs):
+            name_item = QTableWidgetItem(club["name"])
+            name_item.setData(Qt.UserRole, club["club_id"])
+            self.clubs_table.setItem(i, 0, name_item)
+            self.clubs_table.setItem(i, 1, QTableWidgetItem(club["description"] or "No description"))
+            self.clubs_table.setItem(i, 2, QTableWidgetItem(str(club["member_count"])))
+            self.clubs_table.setItem(i, 3, QTableWidgetItem("Yes" if club["club_id"] in mine else ""))
+
+    def selected_club(self):
+        row = self.clubs_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "No Club Selected", "Select a club first.")
+            return None, None
+        item = self.clubs_table.item(row, 0)
+        return item.data(Qt.UserRole), item.text()
+
+    def join_selected_club(self):
+        club_id, name = self.selected_club()
+        if club_id is None:
+            return
+        if ClubDAO.join_club(club_id, self.member_id):
+            QMessageBox.information(self, "Joined!", f"You are now a member of <b>{name}</b>!")
+        else:
+            QMessageBox.information(self, "Already a Member", f"You already belong to <b>{name}</b>.")
+        self.refresh_clubs()
+
+    def leave_selected_club(self):
+        club_id, name = self.selected_club()
+        if club_id is None:
+            return
+        if ClubDAO.leave_club(club_id, self.member_id):
+            QMessageBox.information(self, "Left Club", f"You have left <b>{name}</b>.")
+        else:
+            QMessageBox.information(self, "Not a Member", f"You are not a member of <b>{name}</b>.")
+        self.refresh_clubs()
@@ -0,0 +1,110 @@
+# ui/table_sync.py
+from PyQt5.QtGui import QBrush
+from PyQt5.QtWidgets import QTableWidgetItem
+
+def set_cell(table, row, col, text, foreground=None, align=None):
+    """Writes a cell, reusing the existing item instead of allocating a new one."""
+    item = table.item(row, col)
+    if item is None:
+        item = QTableWidgetItem()
+        table.setItem(row, col, item)
+    if item.text() != text:
+        item.setText(text)
+    if foreground is not None:
+        item.setForeground(QBrush(foreground))
+    if align is not None:
+        item.setTextAlignment(align)
+    return item
+
+def _longest_increasing(seq):
+    """Indexes into seq of one longest strictly increasing subsequence (O(n log n))."""
+    tails = []               # tails[j]: index of the smallest tail of an increasing run of length j+1
+    prev = [None] * len(seq)
+    for i, value in enumerate(seq):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seq[tails[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        prev[i] = tails[lo - 1] if lo else None
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+    keep = set()
+    i = tails[-1] if tails else None
+    while i is not None:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+class KeyedTableSync:
+    """Keeps a QTableWidget in step with a list of records keyed by one field.
+
+    apply() compares the new records with the ones last shown and only inserts,
+    re-renders or removes the rows that differ, so a refresh after one borrow
+    touches one row instead of rebuilding every item and button in the table.
+    When the order changes, the longest run of rows already in the right
+    relative order stays put and only the others are moved, so one record
+    changing place costs one row however far it travels.
+    render_row(row, record) fills a row; on updates it should reuse the row's
+    existing items/widgets (see set_cell). Widgets in removed rows are deleted
+    by Qt along with the row. Keys must be unique within records.
+    """
+    def __init__(self, table, key, render_row):
+        self.table = table
+        self.key = key
+        self.render_row = render_row
+        self.keys = []        # key of each table row, top to bottom
+        self.records = {}     # key -> record as last rendered
+
+    def record(self, key):
+        return self.records.get(key)
+
+    def apply(self, records):
+        position = {r[self.key]: i for i, r in enumerate(records)}
+        if len(position) != len(records):
+            raise ValueError(f"records contain duplicate {self.key!r} values")
+        counts = {"inserted": 0, "updated": 0, "removed": 0, "moved": 0}
+
+        for row in range(len(self.keys) - 1, -1, -1):
+            if self.keys[row] not in position:
+                self.table.removeRow(row)
+                del self.records[self.keys.pop(row)]
+                counts["removed"] += 1
+
+        # Rows outside the longest run already in the new relative order are
+        # taken out here and re-created at their new place below.
+        keep = _longest_increasing([position[k] for k in self.keys])
+        moving = set()
+        for row in range(len(self.keys) - 1, -1, -1):
+            if row not in keep:
+                self.table.removeRow(row)
+                moving.add(self.keys.pop(row))
+        counts["moved"] = len(moving)
+
+        # The remaining keys are a subsequence of records, so every mismatch at
+        # row i is a row to insert there.
+        for i, record in enumerate(records):
+            k = record[self.key]
+            if i < len(self.keys) and self.keys[i] == k:
+                if self.records[k] != record:
+                    self.records[k] = dict(record)
+                    self.render_row(i, record)
+                    counts["updated"] += 1
+                continue
+
+            if k not in moving:
+                counts["inserted"] += 1
+            self.table.insertRow(i)
+            self.keys.insert(i, k)
+            self.records[k] = dict(record)
+            self.render_row(i, record)
+        return counts
+
+    def clear(self):
+        self.table.setRowCount(0)
+        self.keys = []
+        self.records = {}
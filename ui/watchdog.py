@@ -0,0 +1,150 @@
+# ui/watchdog.py
+# Opt-in event-loop stall watchdog (python main.py --watchdog).
+#
+# A QTimer on the GUI thread records a heartbeat every HEARTBEAT_MS; how far the
+# gap between beats overran HEARTBEAT_MS is the event-loop delay, i.e. how long
+# the GUI was frozen. A monitor thread checks the heartbeat and,
+# once the GUI thread has been silent for longer than the threshold, samples
+# the GUI thread's stack until it recovers. Each stall is logged with its
+# duration, the dashboard methods and DAO call on the stack (e.g.
+# "LibrarianDashboard.return_book > LibrarianDashboard.load_loans",
+# "LoanDAO.get_active_loans"), the stack itself and the delay histogram.
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from PyQt5.QtCore import QTimer
+
+from utils.constants import WATCHDOG_LOG_PATH, WATCHDOG_THRESHOLD_MS
+
+HEARTBEAT_MS = 50
+POLL_SECONDS = 0.025
+HISTOGRAM_BOUNDS_MS = [16, 33, 50, 100, 250, 500, 1000, 2000, 5000]
+DASHBOARD_CLASSES = ("LibrarianDashboard", "MemberDashboard", "LoginWindow")
+
+def _histogram_label(i):
+    if i == len(HISTOGRAM_BOUNDS_MS):
+        return f">={HISTOGRAM_BOUNDS_MS[-1]}ms"
+    return f"<{HISTOGRAM_BOUNDS_MS[i]}ms"
+
+def attribute(frame):
+    """(dashboard method chain, innermost DAO call) for a stack, outermost first."""
+    methods, dao_call = [], None
+    for f, _ in traceback.walk_stack(frame):
+        code = f.f_code
+        owner = f.f_locals.get(code.co_varnames[0]) if code.co_argcount else None
+        name = code.co_name
+        module = f.f_globals.get("__name__", "")
+        if owner is not None and type(owner).__name__ in DASHBOARD_CLASSES:
+            methods.append(f"{type(owner).__name__}.{name}")
+        elif dao_call is None and module.startswith("dao."):
+            # DAO methods are staticmethods, so take the class from the qualified name
+            qualname = getattr(code, "co_qualname", name)
+            dao_call = qualname if "." in qualname else f"{module}.{name}"
+    methods.reverse()
+    return " > ".join(methods) or "(no dashboard method)", dao_call
+
+class StallWatchdog:
+    def __init__(self, app, threshold_ms=WATCHDOG_THRESHOLD_MS, log_path=WATCHDOG_LOG_PATH):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self.main_thread_id = threading.get_ident()
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.stall_count = 0
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+
+        log_path = os.path.expanduser(log_path)
+        os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+        self.log = logging.getLogger("smart_library.watchdog")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        if not self.log.handlers:
+            handler = RotatingFileHandler(log_path, maxBytes=1024 * 1024, backupCount=5, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+        self.log_path = log_path
+
+        self.timer = QTimer()
+        self.timer.setInterval(HEARTBEAT_MS)
+        self.timer.timeout.connect(self._beat)
+        self.monitor = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self.timer.start()
+        self.monitor.start()
+        self.app.aboutToQuit.connect(self.stop)
+        self.log.info(f"watchdog started threshold={self.threshold * 1000:.0f}ms heartbeat={HEARTBEAT_MS}ms")
+        print(f"DEBUG: Stall watchdog on, logging to {self.log_path}")
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self.timer.stop()
+        self.log.info(f"watchdog stopped stalls={self.stall_count} loop_delay={self.histogram_text()}")
+
+    # GUI thread
+    def _beat(self):
+        now = time.monotonic()
+        delay_ms = max(0.0, (now - self._last_beat) * 1000 - HEARTBEAT_MS)
+        self._last_beat = now
+        bucket = next((i for i, b in enumerate(HISTOGRAM_BOUNDS_MS) if delay_ms < b), len(HISTOGRAM_BOUNDS_MS))
+        self.histogram[bucket] += 1
+
+    def histogram_text(self):
+        return " ".join(f"{_histogram_label(i)}:{n}" for i, n in enumerate(self.histogram) if n)
+
+    # monitor thread
+    def _watch(self):
+        while not self._stop.wait(POLL_SECONDS):
+            stalled_for = time.monotonic() - self._last_beat - HEARTBEAT_MS / 1000
+            if stalled_for > self.threshold:
+                self._record_stall()
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return None
+        methods, dao_call = attribute(frame)
+        stack = "".join(traceback.format_stack(frame))
+        return methods, dao_call, stack
+
+    def _record_stall(self):
+        beat = self._last_beat
+        started = time.monotonic()
+        tags = Counter()
+        calls = Counter()
+        first_stack = None
+        while self._last_beat == beat and not self._stop.is_set():
+            sample = self._sample()
+            if sample:
+                methods, dao_call, stack = sample
+                tags[methods] += 1
+                if dao_call:
+                    calls[dao_call] += 1
+                if first_stack is None:
+                    first_stack = stack
+            time.sleep(POLL_SECONDS)
+
+        self.stall_count += 1
+        # The next beat was due HEARTBEAT_MS after the last one; only the time past
+        # that is the freeze (the same allowance _watch makes for detection).
+        due = beat + HEARTBEAT_MS / 1000
+        duration_ms = (time.monotonic() - due) * 1000
+        method = tags.most_common(1)[0][0] if tags else "(unknown)"
+        call = calls.most_common(1)[0][0] if calls else "-"
+        self.log.warning(
+            f"STALL #{self.stall_count} {duration_ms:.0f}ms in {method} call={call} "
+            f"samples={sum(tags.values())} (detected after {(started - due) * 1000:.0f}ms)\n"
+            f"  methods: {dict(tags)}\n"
+            f"  calls: {dict(calls)}\n"
+            f"  loop_delay: {self.histogram_text()}\n"
+            f"  stack at detection:\n{first_stack or '  (unavailable)'}"
+        )
@@ -1,4 +1,10 @@
 ROLE_LIBRARIAN = "Librarian"
 ROLE_MEMBER = "Member"
 MAX_LOANS = 3
-LOAN_DAYS = 7
\ No newline at end of file
+LOAN_DAYS = 7
+CATALOG_REPLICA_PATH = "~/.smart_library/catalog.sqlite3"
+CATALOG_SYNC_SECONDS = 30
+CATALOG_CHANGE_RETENTION_DAYS = 7
+HOLD_POSITION_CAP = 100
+WATCHDOG_THRESHOLD_MS = 200
+WATCHDOG_LOG_PATH = "~/.smart_library/stalls.log"
\ No newline at end of file